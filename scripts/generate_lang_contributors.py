@@ -1,6 +1,6 @@
 import subprocess
 import os
-from collections import defaultdict
+from functools import lru_cache
 
 # Get the absolute path of the script's directory, then go up to the project root.
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,64 +19,149 @@ files_by_lang = {
     "typescript": ["src/codegraphcontext/tools/languages/typescript.py"],
 }
 
-def get_contributor_stats(files):
+# Marks the start of each commit record in the NUL-delimited 'git log -z' output.
+RECORD_MARKER = b"RECORD"
+
+def iter_nul_tokens(stream, chunk_size=65536):
+    """
+    Yields the NUL-separated tokens of a binary stream without reading it all into memory.
+    """
+    pending = b""
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        tokens = (pending + chunk).split(b"\0")
+        pending = tokens.pop()
+        yield from tokens
+    if pending:
+        yield pending
+
+def get_contributor_stats(files_by_lang):
     """
-    Returns a dictionary of contributors with commit count, lines added, and lines deleted.
-    This is done by parsing the output of 'git log'.
+    Returns a dictionary mapping each language to its contributors with commit count,
+    lines added, and lines deleted.
+    This is done by parsing the output of a single 'git log' over all tracked files,
+    routing each numstat line to its language by file path.
     """
-    data = defaultdict(lambda: {"commits": 0, "added": 0, "deleted": 0, "email": ""})
-    
+    path_to_lang = {path.encode(): lang for lang, paths in files_by_lang.items() for path in paths}
+    # Authors are kept as raw bytes while parsing and only decoded once per author at the end.
+    per_lang_data = {lang: {} for lang in files_by_lang}
+    file_args = [path.decode() for path in path_to_lang]
+
+    def author_entry(data, author):
+        # Plain get-or-create avoids calling a Python-level default factory on every miss.
+        entry = data.get(author)
+        if entry is None:
+            entry = data[author] = {"commits": 0, "added": 0, "deleted": 0, "email": b""}
+        return entry
+
+    def flush_commit(author, email, touched_langs):
+        # A commit counts once for every language whose files it touched.
+        for lang in touched_langs:
+            entry = author_entry(per_lang_data[lang], author)
+            entry["commits"] += 1
+            entry["email"] = email
+
+    def route_numstat(author, added, deleted, path, touched_langs):
+        lang = path_to_lang.get(path)
+        if lang is None:
+            return
+        entry = author_entry(per_lang_data[lang], author)
+        entry["added"] += int(added) if added != b"-" else 0
+        entry["deleted"] += int(deleted) if deleted != b"-" else 0
+        touched_langs.add(lang)
+
     try:
         # Use 'git log' with '--numstat' to get file changes, author name, and email in one go.
-        log_output = subprocess.check_output(
-            ["git", "log", "--no-merges", "--numstat", "--pretty=format:---%n%an%n%ae", "--"] + files,
-            text=True,
+        # '-z' and NUL-delimited record headers make the output unambiguous, and it is
+        # streamed so the full history is never held in memory.
+        proc = subprocess.Popen(
+            ["git", "log", "--no-merges", "-z", "--numstat", "--format=%x00RECORD%x00%an%x00%ae", "--"] + file_args,
+            stdout=subprocess.PIPE,
             cwd=PROJECT_ROOT
-        ).strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error fetching git log for files {files}: {e}")
-        return data
+        )
+    except OSError as e:
+        print(f"Error fetching git log for files {file_args}: {e}")
+        return per_lang_data
 
-    if not log_output:
-        return data
+    author = email = None
+    touched_langs = set()
+    expect_author = expect_email = False
+    # For renames, '-z --numstat' emits "added\tdeleted\t" followed by the old and new paths
+    # as two separate tokens.
+    rename_stat = None
+    rename_paths = []
 
-    commits = log_output.split('---')[1:]
+    with proc.stdout:
+        for token in iter_nul_tokens(proc.stdout):
+            if token == RECORD_MARKER:
+                if author:
+                    flush_commit(author, email, touched_langs)
+                author = email = None
+                touched_langs = set()
+                rename_stat = None
+                expect_author = True
+                continue
+            if expect_author:
+                author = token.strip()
+                expect_author = False
+                expect_email = True
+                continue
+            if expect_email:
+                email = token.strip()
+                expect_email = False
+                continue
 
-    for commit in commits:
-        lines = commit.strip().split('\n')
-        author = lines[0].strip()
-        email = lines[1].strip()
-        if not author:
-            continue
-        
-        data[author]["commits"] += 1
-        data[author]["email"] = email
-        
-        for line in lines[2:]:
-            if not line.strip():
+            if not author:
+                continue
+
+            if rename_stat is not None:
+                rename_paths.append(token)
+                if len(rename_paths) == 2:
+                    old_path, new_path = rename_paths
+                    path = new_path if new_path in path_to_lang else old_path
+                    route_numstat(author, *rename_stat, path, touched_langs)
+                    rename_stat = None
+                continue
+
+            token = token.lstrip(b"\n")
+            if not token:
                 continue
-            
-            parts = line.split("\t")
-            if len(parts) >= 3:
-                added, deleted, _ = parts
-                added = int(added) if added != "-" else 0
-                deleted = int(deleted) if deleted != "-" else 0
-                data[author]["added"] += added
-                data[author]["deleted"] += deleted
-                
-    return data
+
+            parts = token.split(b"\t", 2)
+            if len(parts) == 3:
+                added, deleted, path = parts
+                if path:
+                    route_numstat(author, added, deleted, path, touched_langs)
+                else:
+                    rename_stat = (added, deleted)
+                    rename_paths = []
+
+    if author:
+        flush_commit(author, email, touched_langs)
+
+    if proc.wait() != 0:
+        print(f"Error fetching git log for files {file_args}: git exited with status {proc.returncode}")
+
+    return {
+        lang: {
+            author.decode(errors="replace"): {**vals, "email": vals["email"].decode(errors="replace")}
+            for author, vals in data.items()
+        }
+        for lang, data in per_lang_data.items()
+    }
 
 def get_username_from_email(email):
     if email.endswith('@users.noreply.github.com'):
         return email.split('+')[1].split('@')[0]
     return None
 
+@lru_cache(maxsize=1)
 def get_repo_url():
     try:
+        # Read the remote straight from the repo config; the result is cached for the run.
         url = subprocess.check_output(
-            ["git", "remote", "get-url", "origin"],
+            ["git", "-C", PROJECT_ROOT, "config", "--get", "remote.origin.url"],
             text=True,
-            cwd=PROJECT_ROOT
+            stderr=subprocess.DEVNULL
         ).strip()
         if url.endswith(".git"):
             url = url[:-4]
@@ -86,15 +171,29 @@ def get_repo_url():
     except Exception:
         return None
 
-def generate_markdown_table(lang, stats, repo_url, files):
+def iter_markdown_table(lang, stats, repo_url, files):
     """
-    Generates a Markdown table for contributors
+    Yields the lines of a Markdown table for contributors, so it can be streamed to disk
     """
-    table = f"## {lang.capitalize()} Contributors\n\n"
-    table += "| Rank | Contributor | Commits | Lines Added | Lines Deleted | Link to Contributions |\n"
-    table += "|---|---|---|---|---|---|\n"
+    yield f"## {lang.capitalize()} Contributors\n\n"
+    yield "| Rank | Contributor | Commits | Lines Added | Lines Deleted | Link to Contributions |\n"
+    yield "|---|---|---|---|---|---|\n"
+
+    # Sort a decorated list so the dict lookups happen once per contributor.
+    # Negated counts give descending order. Ties keep insertion order, as a stable sort would,
+    # and the index is unique, so comparison never reaches the author or the dicts.
+    decorated = [
+        (-vals["commits"], -vals["added"], i, author, vals)
+        for i, (author, vals) in enumerate(stats.items())
+    ]
+    decorated.sort()
+    # The file name and link prefix only depend on the file, so build them once.
+    file_link_templates = [
+        (os.path.basename(file_path), f"{repo_url}/commits/main/{file_path}?author=")
+        for file_path in files
+    ]
 
-    for rank, (author, vals) in enumerate(sorted(stats.items(), key=lambda x: (x[1]["commits"], x[1]["added"]), reverse=True), 1):
+    for rank, (_, _, _, author, vals) in enumerate(decorated, 1):
         email = vals["email"]
         username = get_username_from_email(email)
         
@@ -105,17 +204,14 @@ def generate_markdown_table(lang, stats, repo_url, files):
             profile_str = author
             author_for_link = email
 
-        contribution_links = []
-        for file_path in files:
-            file_name = os.path.basename(file_path)
-            link = f"[{file_name}]({repo_url}/commits/main/{file_path}?author={author_for_link})"
-            contribution_links.append(link)
+        contribution_links = [
+            f"[{file_name}]({link_prefix}{author_for_link})"
+            for file_name, link_prefix in file_link_templates
+        ]
         
         links_str = ", ".join(contribution_links)
 
-        table += f"| {rank} | {profile_str} | {vals['commits']} | {vals['added']} | {vals['deleted']} | {links_str} |\n"
-    
-    return table
+        yield f"| {rank} | {profile_str} | {vals['commits']} | {vals['added']} | {vals['deleted']} | {links_str} |\n"
 
 def main():
     repo_url = get_repo_url()
@@ -126,11 +222,12 @@ def main():
     with open(output_file, "w") as f:
         f.write("# Language Contributors\n\n")
         f.write("This file is auto-generated. Do not edit manually.\n\n")
+        per_lang_data = get_contributor_stats(files_by_lang)
         for lang, files in files_by_lang.items():
-            stats = get_contributor_stats(files)
+            stats = per_lang_data[lang]
             if stats:
-                table = generate_markdown_table(lang, stats, repo_url, files)
-                f.write(table + "\n\n")
+                f.writelines(iter_markdown_table(lang, stats, repo_url, files))
+                f.write("\n\n")
     print(f"Contributor stats generated in {output_file}")
 
 if __name__ == "__main__":
@@ -1,23 +1,33 @@
 # src/codegraphcontext/cli/cli_helpers.py
 import asyncio
+import atexit
 import json
+import os
+import textwrap
 import urllib.parse
 from pathlib import Path
 import time
 from rich.console import Console
 from rich.table import Table
 
-from ..core.database import DatabaseManager
-from ..core.jobs import JobManager
-from ..tools.code_finder import CodeFinder
-from ..tools.graph_builder import GraphBuilder
-from ..tools.package_resolver import get_local_package_path
+from ..utils.cypher_safety import FORBIDDEN_CYPHER_RE
+
+# Service modules (Neo4j driver, tree-sitter, package resolution) are imported inside
+# the helpers that use them, so commands that never touch the database start quickly.
 
 console = Console()
 
+# Services shared by every helper call in this process; created on first use.
+_services = None
+
 
 def _initialize_services():
     """Initializes and returns core service managers."""
+    from ..core.database import DatabaseManager
+    from ..core.jobs import JobManager
+    from ..tools.code_finder import CodeFinder
+    from ..tools.graph_builder import GraphBuilder
+
     console.print("[dim]Initializing services and database connection...[/dim]")
     db_manager = DatabaseManager()
     try:
@@ -27,12 +37,10 @@ def _initialize_services():
         console.print("Please ensure your Neo4j credentials are correct and the database is running.")
         return None, None, None
     
-    # The GraphBuilder requires an event loop, even for synchronous-style execution
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    # The GraphBuilder requires an event loop, even for synchronous-style execution.
+    # CLI commands are synchronous, so there is never a running loop to reuse.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
 
     graph_builder = GraphBuilder(db_manager, JobManager(), loop)
     code_finder = CodeFinder(db_manager)
@@ -40,25 +48,41 @@ def _initialize_services():
     return db_manager, graph_builder, code_finder
 
 
+def _get_services():
+    """
+    Returns the shared service managers, initializing them on first use.
+    The database driver stays open for later helper calls and is closed at exit.
+    """
+    global _services
+    if _services is None:
+        services = _initialize_services()
+        if not all(services):
+            return services
+        _services = services
+        atexit.register(services[0].close_driver)
+    return _services
+
+
 def index_helper(path: str):
     """Synchronously indexes a repository."""
     time_start = time.time()
-    services = _initialize_services()
+    services = _get_services()
     if not all(services):
         return
 
-    db_manager, graph_builder, code_finder = services
+    _, graph_builder, code_finder = services
     path_obj = Path(path).resolve()
 
     if not path_obj.exists():
         console.print(f"[red]Error: Path does not exist: {path_obj}[/red]")
-        db_manager.close_driver()
         return
 
     indexed_repos = code_finder.list_indexed_repositories()
-    if any(Path(repo["path"]).resolve() == path_obj for repo in indexed_repos):
+    # Repository paths are stored already resolved, so normalized string comparison is
+    # enough and avoids a filesystem lookup per indexed repository.
+    indexed_paths = {os.path.normpath(repo["path"]) for repo in indexed_repos}
+    if str(path_obj) in indexed_paths:
         console.print(f"[yellow]Repository '{path}' is already indexed. Skipping.[/yellow]")
-        db_manager.close_driver()
         return
 
     console.print(f"Starting indexing for: {path_obj}")
@@ -68,36 +92,36 @@ def index_helper(path: str):
         await graph_builder.build_graph_from_path_async(path_obj, is_dependency=False)
 
     try:
-        asyncio.run(do_index())
+        # Reuse the services' event loop rather than creating and tearing down a new one per call.
+        graph_builder.loop.run_until_complete(do_index())
         time_end = time.time()
         elapsed = time_end - time_start
         console.print(f"[green]Successfully finished indexing: {path} in {elapsed:.2f} seconds[/green]")
     except Exception as e:
         console.print(f"[bold red]An error occurred during indexing:[/bold red] {e}")
-    finally:
-        db_manager.close_driver()
 
 
 def add_package_helper(package_name: str, language: str):
     """Synchronously indexes a package."""
-    services = _initialize_services()
+    from ..tools.package_resolver import get_local_package_path
+
+    services = _get_services()
     if not all(services):
         return
 
-    db_manager, graph_builder, code_finder = services
+    _, graph_builder, code_finder = services
 
     package_path_str = get_local_package_path(package_name, language)
     if not package_path_str:
         console.print(f"[red]Error: Could not find package '{package_name}' for language '{language}'.[/red]")
-        db_manager.close_driver()
         return
 
     package_path = Path(package_path_str)
     
     indexed_repos = code_finder.list_indexed_repositories()
-    if any(repo.get("name") == package_name for repo in indexed_repos if repo.get("is_dependency")):
+    dependency_names = {repo.get("name") for repo in indexed_repos if repo.get("is_dependency")}
+    if package_name in dependency_names:
         console.print(f"[yellow]Package '{package_name}' is already indexed. Skipping.[/yellow]")
-        db_manager.close_driver()
         return
 
     console.print(f"Starting indexing for package '{package_name}' at: {package_path}")
@@ -107,21 +131,19 @@ def add_package_helper(package_name: str, language: str):
         await graph_builder.build_graph_from_path_async(package_path, is_dependency=True)
 
     try:
-        asyncio.run(do_index())
+        graph_builder.loop.run_until_complete(do_index())
         console.print(f"[green]Successfully finished indexing package: {package_name}[/green]")
     except Exception as e:
         console.print(f"[bold red]An error occurred during package indexing:[/bold red] {e}")
-    finally:
-        db_manager.close_driver()
 
 
 def list_repos_helper():
     """Lists all indexed repositories."""
-    services = _initialize_services()
+    services = _get_services()
     if not all(services):
         return
     
-    db_manager, _, code_finder = services
+    _, _, code_finder = services
     
     try:
         repos = code_finder.list_indexed_repositories()
@@ -141,51 +163,48 @@ def list_repos_helper():
         console.print(table)
     except Exception as e:
         console.print(f"[bold red]An error occurred:[/bold red] {e}")
-    finally:
-        db_manager.close_driver()
 
 
 def delete_helper(repo_path: str):
     """Deletes a repository from the graph."""
-    services = _initialize_services()
+    services = _get_services()
     if not all(services):
         return
 
-    db_manager, graph_builder, _ = services
+    _, graph_builder, _ = services
     
     try:
         graph_builder.delete_repository_from_graph(repo_path)
         console.print(f"[green]Successfully deleted repository: {repo_path}[/green]")
     except Exception as e:
         console.print(f"[bold red]An error occurred:[/bold red] {e}")
-    finally:
-        db_manager.close_driver()
 
 
 def cypher_helper(query: str):
     """Executes a read-only Cypher query."""
-    services = _initialize_services()
+    services = _get_services()
     if not all(services):
         return
 
     db_manager, _, _ = services
     
     # Replicating safety checks from MCPServer
-    forbidden_keywords = ['CREATE', 'MERGE', 'DELETE', 'SET', 'REMOVE', 'DROP', 'CALL apoc']
-    if any(keyword in query.upper() for keyword in forbidden_keywords):
+    if FORBIDDEN_CYPHER_RE.search(query):
         console.print("[bold red]Error: This command only supports read-only queries.[/bold red]")
-        db_manager.close_driver()
         return
 
     try:
         with db_manager.get_driver().session() as session:
             result = session.run(query)
-            records = [record.data() for record in result]
-            console.print(json.dumps(records, indent=2))
+            # Stream the records as a JSON array instead of collecting the whole result first.
+            first = True
+            for record in result:
+                item = textwrap.indent(json.dumps(record.data(), indent=2), "  ")
+                console.print(("[\n" if first else ",\n") + item, end="")
+                first = False
+            console.print("[]" if first else "\n]")
     except Exception as e:
         console.print(f"[bold red]An error occurred while executing query:[/bold red] {e}")
-    finally:
-        db_manager.close_driver()
 
 
 def visualize_helper(query: str):
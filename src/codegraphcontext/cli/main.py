@@ -17,12 +17,13 @@ import asyncio
 import logging
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
 from importlib.metadata import version as pkg_version, PackageNotFoundError
 
-from codegraphcontext.server import MCPServer
-from .setup_wizard import run_setup_wizard
+# `MCPServer` and the setup wizard pull in the Neo4j driver and tree-sitter, so they are
+# imported inside the commands that need them to keep `cgc --version` and `cgc help` fast.
 # Import the new helper functions
 from .cli_helpers import (
     index_helper,
@@ -49,6 +50,7 @@ console = Console(stderr=True)
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 
 
+@lru_cache(maxsize=1)
 def get_version() -> str:
     """
     Try to read version from the installed package metadata.
@@ -66,6 +68,7 @@ def setup():
     Runs the interactive setup wizard to configure the server and database connection.
     This helps users set up a local Docker-based Neo4j instance or connect to a remote one.
     """
+    from .setup_wizard import run_setup_wizard
     run_setup_wizard()
 
 def _load_credentials():
@@ -117,6 +120,8 @@ def start():
     """
     Starts the CodeGraphContext MCP server, which listens for JSON-RPC requests from stdin.
     """
+    from codegraphcontext.server import MCPServer
+
     console.print("[bold green]Starting CodeGraphContext Server...[/bold green]")
     _load_credentials()
 
@@ -146,6 +151,10 @@ def index(path: Optional[str] = typer.Argument(None, help="Path to the directory
     """
     Indexes a directory or file by adding it to the code graph.
     If no path is provided, it indexes the current directory.
+
+    Set CGC_PARSE_CACHE=1 to keep parse results in ~/.codegraphcontext/parse-cache, so
+    unchanged files are not parsed again on the next run. CGC_PARSE_CACHE_MAX_MB caps its
+    size (default 512).
     """
     _load_credentials() # Credentials must be loaded before helpers are called
     if path is None:
@@ -200,6 +209,8 @@ def list_mcp_tools():
     """
     Lists all available tools and their descriptions.
     """
+    from codegraphcontext.server import MCPServer
+
     _load_credentials()
     console.print("[bold green]Available Tools:[/bold green]")
     try:
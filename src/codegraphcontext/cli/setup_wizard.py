@@ -683,10 +683,14 @@ volumes:
             # Wait for Neo4j to be ready
             console.print("[cyan]Waiting for Neo4j to be ready (this may take 30-60 seconds)...[/cyan]")
             
-            # Try to connect for up to 2 minutes
-            max_attempts = 24  # 24 * 5 seconds = 2 minutes
-            for attempt in range(max_attempts):
-                time.sleep(5)
+            # Try to connect for up to 2 minutes. Polls start short and back off
+            # exponentially to 5 seconds, so a fast startup is noticed quickly.
+            deadline = time.monotonic() + 120
+            connection_successful = False
+            attempt = 0
+            while True:
+                time.sleep(min(5.0, 0.25 * 2 ** attempt))
+                attempt += 1
                 
                 # Check if container is still running
                 status_check = run_command(["docker", "compose", "ps", "-q", "neo4j"], console, check=False)
@@ -695,7 +699,7 @@ volumes:
                     return
                 
                 # updated test_connection method
-                console.print(f"[yellow]Testing connection... (attempt {attempt + 1}/{max_attempts})[/yellow]")
+                console.print(f"[yellow]Testing connection... (attempt {attempt})[/yellow]")
                 is_connected, error_msg = DatabaseManager.test_connection(DEFAULT_NEO4J_URI, DEFAULT_NEO4J_USERNAME, password)
                 
                 if is_connected:
@@ -705,7 +709,7 @@ volumes:
                 
                 else:
                     # Only show detailed error on last attempt
-                    if attempt == max_attempts - 1:
+                    if time.monotonic() >= deadline:
                         console.print("\n[red]❌ Neo4j did not become ready within 2 minutes.[/red]")
                         console.print(error_msg)
                         console.print("\n[cyan]Troubleshooting:[/cyan]")
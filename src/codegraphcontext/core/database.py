@@ -2,14 +2,186 @@
 """
 This module provides a thread-safe singleton manager for the Neo4j database connection.
 """
+import ipaddress
 import os
 import re
+import socket
 import threading
-from typing import Optional, Tuple
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final, Optional, Tuple
+from urllib.parse import urlsplit
 from neo4j import GraphDatabase, Driver
 
 from codegraphcontext.utils.debug_log import debug_log, info_logger, error_logger, warning_logger
 
+# Seconds for which a successful `is_connected` check is reused without another round-trip.
+CONNECTION_CHECK_TTL = 5.0
+
+# Connection pool sizing, overridable through NEO4J_POOL_SIZE and NEO4J_POOL_LIFETIME (seconds).
+DEFAULT_POOL_SIZE = 50
+DEFAULT_POOL_LIFETIME = 3600
+
+# Supported Neo4j URI schemes, used as a cheap prefix check before the full regex.
+_URI_SCHEMES = ("neo4j://", "neo4j+s://", "neo4j+ssc://", "bolt://", "bolt+s://", "bolt+ssc://")
+_URI_RE = re.compile(r'^(?:neo4j|neo4j\+s|neo4j\+ssc|bolt|bolt\+s|bolt\+ssc)://[^:]+:\d+$')
+
+# Troubleshooting text for each kind of driver error `_describe_connection_error` recognizes.
+_CONNECTION_ERROR_HELP = {
+    "auth": (
+        "Authentication failed - Invalid username or password\n"
+        "Troubleshooting:\n"
+        "  • Default username is 'neo4j'\n"
+        "  • Did you change the password during initial setup?\n"
+        "  • If you forgot the password, you may need to reset Neo4j:\n"
+        "    - Stop: docker compose down\n"
+        "    - Remove data: docker volume rm <volume_name>\n"
+        "    - Restart: docker compose up -d"
+    ),
+    "unavailable": (
+        "Neo4j service is not available\n"
+        "Troubleshooting:\n"
+        "  • Is Neo4j running? Check: docker ps\n"
+        "  • Start Neo4j: docker compose up -d\n"
+        "  • Check logs: docker compose logs neo4j\n"
+        "  • Wait 30-60 seconds after starting for Neo4j to initialize"
+    ),
+    "routing": (
+        "Cannot connect to Neo4j routing\n"
+        "Troubleshooting:\n"
+        "  • Try using 'bolt://' instead of 'neo4j://' in the URI\n"
+        "  • Example: bolt://localhost:7687"
+    ),
+}
+
+# Validation results are shared constants, so the error path returns a prebuilt tuple.
+_RESULT_OK: Final = (True, None)
+_RESULT_BAD_URI: Final = (False, (
+    "Invalid Neo4j URI format.\n"
+    "Expected format: neo4j://host:port or bolt://host:port\n"
+    "Example: neo4j://localhost:7687\n"
+    "Common mistake: Missing 'neo4j://' or 'bolt://' prefix"
+))
+_RESULT_EMPTY_USER: Final = (False, (
+    "Username cannot be empty.\n"
+    "Default Neo4j username is 'neo4j'"
+))
+_RESULT_EMPTY_PW: Final = (False, (
+    "Password cannot be empty.\n"
+    "Tip: If you just set up Neo4j, use the password you configured during setup"
+))
+
+def _validate_config(uri: str, username: str, password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Validates Neo4j configuration parameters.
+    Not cached: a cache keyed on the arguments would keep the password in memory.
+    """
+    # Validate URI format
+    if not uri.startswith(_URI_SCHEMES) or not _URI_RE.match(uri):
+        return _RESULT_BAD_URI
+    
+    # Validate username
+    if not username or not username.strip():
+        return _RESULT_EMPTY_USER
+    
+    # Validate password
+    if not password or not password.strip():
+        return _RESULT_EMPTY_PW
+    
+    return _RESULT_OK
+
+def _describe_connection_error(error: Exception) -> str:
+    """Returns troubleshooting text for a driver error, falling back to the raw message."""
+    error_msg = str(error).lower()
+
+    # Checked in priority order: an error mentioning several causes gets the first one's help.
+    if "authentication" in error_msg or "unauthorized" in error_msg:
+        return _CONNECTION_ERROR_HELP["auth"]
+    elif "serviceunavailable" in error_msg or "failed to establish connection" in error_msg:
+        return _CONNECTION_ERROR_HELP["unavailable"]
+    elif "unable to retrieve routing information" in error_msg:
+        return _CONNECTION_ERROR_HELP["routing"]
+    return f"Connection failed: {str(error)}"
+
+@lru_cache(maxsize=32)
+def _parse_uri(uri: str) -> Tuple[Optional[str], Optional[int]]:
+    """Splits a Neo4j URI into its (host, port) pair, caching the result per URI."""
+    parts = urlsplit(uri)
+    return parts.hostname, parts.port
+
+@lru_cache(maxsize=32)
+def _is_ip_literal(host: str) -> bool:
+    """Returns True if the host is an IPv4 or IPv6 address rather than a name."""
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+def _open_probe_connection(host: str, port: int, timeout: float) -> None:
+    """
+    Opens and closes a TCP connection to host:port, trying every resolved address.
+    IP-literal hosts are resolved with AI_NUMERICHOST so no name lookup is attempted.
+    """
+    flags = socket.AI_NUMERICHOST if _is_ip_literal(host) else 0
+    last_error: Optional[OSError] = None
+    for family, sock_type, proto, _, address in socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, flags=flags
+    ):
+        try:
+            with socket.socket(family, sock_type, proto) as sock:
+                sock.settimeout(timeout)
+                sock.connect(address)
+            return
+        except OSError as e:
+            last_error = e
+    raise last_error or OSError(f"getaddrinfo returned no addresses for {host}")
+
+def _int_from_env(name: str, default: int) -> int:
+    """Reads a positive integer setting from the environment, warning and using `default` if it is invalid."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        number = int(value)
+        if number <= 0:
+            raise ValueError
+    except ValueError:
+        warning_logger(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+    return number
+
+@dataclass(frozen=True, repr=False)
+class Neo4jConfig:
+    """Immutable Neo4j connection settings, read once from the environment."""
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10.
+    __slots__ = ('uri', 'username', 'password', 'pool_size', 'pool_lifetime')
+
+    uri: Optional[str]
+    username: Optional[str]
+    password: Optional[str]
+    pool_size: int
+    pool_lifetime: int
+
+    def __repr__(self) -> str:
+        # Keep the password out of logs and tracebacks.
+        return (
+            f"Neo4jConfig(uri={self.uri!r}, username={self.username!r}, "
+            f"pool_size={self.pool_size!r}, pool_lifetime={self.pool_lifetime!r})"
+        )
+
+    @classmethod
+    def from_env(cls) -> "Neo4jConfig":
+        """Builds the config from the NEO4J_* environment variables."""
+        return cls(
+            uri=os.getenv('NEO4J_URI'),
+            username=os.getenv('NEO4J_USERNAME', 'neo4j'),
+            password=os.getenv('NEO4J_PASSWORD'),
+            pool_size=_int_from_env('NEO4J_POOL_SIZE', DEFAULT_POOL_SIZE),
+            pool_lifetime=_int_from_env('NEO4J_POOL_LIFETIME', DEFAULT_POOL_LIFETIME),
+        )
+
 class DatabaseManager:
     """
     Manages the Neo4j database driver as a singleton to ensure only one
@@ -18,18 +190,27 @@ class DatabaseManager:
     This pattern is crucial for performance and resource management in a
     multi-threaded or asynchronous application.
     """
+    # Instance state lives in slots; the singleton bookkeeping below stays on the class.
+    __slots__ = ('config', '_initialized', '_driver', '_last_ok_ts')
+
     _instance = None
-    _driver: Optional[Driver] = None
+    config: Neo4jConfig
     _lock = threading.Lock() # Lock to ensure thread-safe initialization. 
+    _ready = threading.Event() # Set once a driver initialization attempt has finished.
+    _driver: Optional[Driver]
+    _last_ok_ts: float # Monotonic time of the last successful `is_connected` check.
 
     def __new__(cls):
         """Standard singleton pattern implementation."""
-        if cls._instance is None:
+        # Read the class attribute once; after creation no lock is taken.
+        instance = cls._instance
+        if instance is None:
             with cls._lock:
                 # Double-check locking to prevent race conditions.
                 if cls._instance is None:
                     cls._instance = super(DatabaseManager, cls).__new__(cls)
-        return cls._instance
+            instance = cls._instance
+        return instance
 
     def __init__(self):
         """
@@ -39,9 +220,9 @@ class DatabaseManager:
         if hasattr(self, '_initialized'):
             return
 
-        self.neo4j_uri = os.getenv('NEO4J_URI')
-        self.neo4j_username = os.getenv('NEO4J_USERNAME', 'neo4j')
-        self.neo4j_password = os.getenv('NEO4J_PASSWORD')
+        self.config = Neo4jConfig.from_env()
+        self._driver = None
+        self._last_ok_ts = 0.0
         self._initialized = True
 
     def get_driver(self) -> Driver:
@@ -55,11 +236,24 @@ class DatabaseManager:
         Returns:
             The active Neo4j Driver instance.
         """
-        if self._driver is None:
-            with self._lock:
+        # Read the driver once into a local; after initialization this is the only lookup.
+        driver = self._driver
+        if driver is None:
+            if not self._lock.acquire(blocking=False):
+                # Another thread is creating the driver: sleep on the ready event instead of
+                # queuing on the lock for the whole connection handshake.
+                self._ready.wait(timeout=60)
+                driver = self._driver
+                if driver is not None:
+                    return driver
+                # That attempt failed or is taking too long; try to initialize here instead.
+                self._lock.acquire()
+            try:
                 if self._driver is None:
+                    self._ready.clear()
+                    config = self.config
                     # Ensure all necessary credentials are provided.
-                    if not all([self.neo4j_uri, self.neo4j_username, self.neo4j_password]):
+                    if not all([config.uri, config.username, config.password]):
                         raise ValueError(
                             "Neo4j credentials must be set via environment variables:\n"
                             "- NEO4J_URI\n"
@@ -69,55 +263,75 @@ class DatabaseManager:
                     
                     #validating the config before creating the driver/attempting connection
                     is_valid, validation_error = self.validate_config(
-                    self.neo4j_uri, 
-                    self.neo4j_username, 
-                    self.neo4j_password
+                    config.uri, 
+                    config.username, 
+                    config.password
                     )
                     
                     if not is_valid:
                         error_logger(f"Configuration validation failed: {validation_error}")
                         raise ValueError(validation_error)
 
-                    info_logger(f"Creating Neo4j driver connection to {self.neo4j_uri}")
-                    self._driver = GraphDatabase.driver(
-                        self.neo4j_uri,
-                        auth=(self.neo4j_username, self.neo4j_password)
+                    info_logger(f"Creating Neo4j driver connection to {config.uri}")
+                    # An explicitly sized pool keeps warm connections around for the server's
+                    # worker threads instead of reconnecting under load.
+                    new_driver = GraphDatabase.driver(
+                        config.uri,
+                        auth=(config.username, config.password),
+                        max_connection_pool_size=config.pool_size,
+                        max_connection_lifetime=config.pool_lifetime,
+                        connection_acquisition_timeout=30,
+                        keep_alive=True,
                     )
                     # Test the connection immediately to fail fast if credentials are wrong.
+                    # verify_connectivity only performs the handshake, without running Cypher.
                     try:
-                        with self._driver.session() as session:
-                            session.run("RETURN 1").consume()
+                        new_driver.verify_connectivity()
                         info_logger("Neo4j connection established successfully")
                     except Exception as e:
-                        # Use detailed error messages from test_connection
-                        _, detailed_error = self.test_connection(
-                            self.neo4j_uri,
-                            self.neo4j_username,
-                            self.neo4j_password
-                        )
-                        error_logger(f"Failed to connect to Neo4j: {e}")
-                        if self._driver:
-                            self._driver.close()
-                        self._driver = None
+                        # Explain the failure with the socket probe and error classifier
+                        # rather than opening a second driver through test_connection.
+                        is_reachable, detailed_error = self._probe_socket(config.uri)
+                        if is_reachable:
+                            detailed_error = _describe_connection_error(e)
+                        error_logger(f"Failed to connect to Neo4j: {e}\n{detailed_error}")
+                        new_driver.close()
                         raise
-        return self._driver
+                    # Only publish the driver once it is verified, since other threads read it unlocked.
+                    self._driver = new_driver
+                driver = self._driver
+            finally:
+                # Wake any waiters whether initialization succeeded or failed.
+                self._ready.set()
+                self._lock.release()
+        return driver
 
     def close_driver(self):
         """Closes the Neo4j driver connection if it exists."""
-        if self._driver is not None:
-            with self._lock:
-                if self._driver is not None:
-                    info_logger("Closing Neo4j driver")
-                    self._driver.close()
-                    self._driver = None
+        # Detach the driver first; the driver's own close() is thread-safe, so no lock is needed.
+        driver = self._driver
+        self._driver = None
+        self._last_ok_ts = 0.0
+        if driver is not None:
+            info_logger("Closing Neo4j driver")
+            driver.close()
 
     def is_connected(self) -> bool:
         """Checks if the database connection is currently active."""
-        if self._driver is None:
+        driver = self._driver
+        if driver is None:
             return False
+        # A recent successful check is trusted, so rapid polling doesn't hit the server each time.
+        if time.monotonic() - self._last_ok_ts < CONNECTION_CHECK_TTL:
+            return True
         try:
-            with self._driver.session() as session:
-                session.run("RETURN 1").consume()
+            # get_server_info reuses an idle pooled connection when one exists, so a healthy
+            # driver answers without a new handshake; fall back to a full connectivity check.
+            try:
+                driver.get_server_info()
+            except Exception:
+                driver.verify_connectivity()
+            self._last_ok_ts = time.monotonic()
             return True
         except Exception:
             return False
@@ -130,32 +344,54 @@ class DatabaseManager:
         Returns:
             Tuple[bool, Optional[str]]: (is_valid, error_message)
         """
-        # Validate URI format
-        uri_pattern = r'^(neo4j|neo4j\+s|neo4j\+ssc|bolt|bolt\+s|bolt\+ssc)://[^:]+:\d+$'
-        if not re.match(uri_pattern, uri):
-            return False, (
-                "Invalid Neo4j URI format.\n"
-                "Expected format: neo4j://host:port or bolt://host:port\n"
-                "Example: neo4j://localhost:7687\n"
-                "Common mistake: Missing 'neo4j://' or 'bolt://' prefix"
-            )
-        
-        # Validate username
-        if not username or len(username.strip()) == 0:
-            return False, (
-                "Username cannot be empty.\n"
-                "Default Neo4j username is 'neo4j'"
-            )
-        
-        # Validate password
-        if not password or len(password.strip()) == 0:
-            return False, (
-                "Password cannot be empty.\n"
-                "Tip: If you just set up Neo4j, use the password you configured during setup"
-            )
+        return _validate_config(uri, username, password)
+
+    @staticmethod
+    def _probe_socket(uri: str) -> Tuple[bool, Optional[str]]:
+        """
+        Checks that the host and port in the URI accept TCP connections.
         
+        Returns:
+            Tuple[bool, Optional[str]]: (is_reachable, error_message)
+        """
+        try:
+            # Extract host and port from URI
+            host, port = _parse_uri(uri)
+            if not host or port is None:
+                # getaddrinfo would otherwise probe localhost for a missing host, and port 0 for a missing port.
+                return _RESULT_BAD_URI
+            
+            # Test socket connection against every address family returned by
+            # getaddrinfo, so IPv6-only hosts are reachable too.
+            try:
+                _open_probe_connection(host, port, timeout=5)
+            except OSError:
+                return False, (
+                    f"Cannot reach Neo4j server at {host}:{port}\n"
+                    "Troubleshooting:\n"
+                    "  • Is Neo4j running? Check with: docker ps (for Docker)\n"
+                    "  • Is the port correct? Default is 7687\n"
+                    "  • Is there a firewall blocking the connection?\n"
+                    f"  • Try: docker compose up -d (if using Docker)"
+                )
+        except Exception as e:
+            return False, f"Error parsing URI or checking connectivity: {str(e)}"
         return True, None
 
+    @staticmethod
+    def _probe_auth(driver: Driver) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies that an open driver can connect and authenticate.
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (is_connected, error_message)
+        """
+        try:
+            driver.verify_connectivity()
+            return True, None
+        except Exception as e:
+            return False, _describe_connection_error(e)
+
     @staticmethod
     def test_connection(uri: str, username: str, password: str) -> Tuple[bool, Optional[str]]:
         """
@@ -164,75 +400,17 @@ class DatabaseManager:
         Returns:
             Tuple[bool, Optional[str]]: (is_connected, error_message)
         """
+        # First, test if the host is reachable
+        is_reachable, error = DatabaseManager._probe_socket(uri)
+        if not is_reachable:
+            return False, error
+
+        # Now test Neo4j authentication
         try:
-            from neo4j import GraphDatabase
-            import socket
-            
-            # First, test if the host is reachable
-            try:
-                # Extract host and port from URI
-                host_port = uri.split('://')[1]
-                host = host_port.split(':')[0]
-                port = int(host_port.split(':')[1])
-                
-                # Test socket connection
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5)
-                result = sock.connect_ex((host, port))
-                sock.close()
-                
-                if result != 0:
-                    return False, (
-                        f"Cannot reach Neo4j server at {host}:{port}\n"
-                        "Troubleshooting:\n"
-                        "  • Is Neo4j running? Check with: docker ps (for Docker)\n"
-                        "  • Is the port correct? Default is 7687\n"
-                        "  • Is there a firewall blocking the connection?\n"
-                        f"  • Try: docker compose up -d (if using Docker)"
-                    )
-            except Exception as e:
-                return False, f"Error parsing URI or checking connectivity: {str(e)}"
-            
-            # Now test Neo4j authentication
             driver = GraphDatabase.driver(uri, auth=(username, password))
-            
-            with driver.session() as session:
-                result = session.run("RETURN 'Connection successful' as status")
-                result.single()
-            
-            driver.close()
-            return True, None
-            
         except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Provide specific error messages for common issues
-            if "authentication" in error_msg or "unauthorized" in error_msg:
-                return False, (
-                    "Authentication failed - Invalid username or password\n"
-                    "Troubleshooting:\n"
-                    "  • Default username is 'neo4j'\n"
-                    "  • Did you change the password during initial setup?\n"
-                    "  • If you forgot the password, you may need to reset Neo4j:\n"
-                    "    - Stop: docker compose down\n"
-                    "    - Remove data: docker volume rm <volume_name>\n"
-                    "    - Restart: docker compose up -d"
-                )
-            elif "serviceunAvailable" in error_msg or "failed to establish connection" in error_msg:
-                return False, (
-                    "Neo4j service is not available\n"
-                    "Troubleshooting:\n"
-                    "  • Is Neo4j running? Check: docker ps\n"
-                    "  • Start Neo4j: docker compose up -d\n"
-                    "  • Check logs: docker compose logs neo4j\n"
-                    "  • Wait 30-60 seconds after starting for Neo4j to initialize"
-                )
-            elif "unable to retrieve routing information" in error_msg:
-                return False, (
-                    "Cannot connect to Neo4j routing\n"
-                    "Troubleshooting:\n"
-                    "  • Try using 'bolt://' instead of 'neo4j://' in the URI\n"
-                    "  • Example: bolt://localhost:7687"
-                )
-            else:
-                return False, f"Connection failed: {str(e)}"
+            return False, _describe_connection_error(e)
+        try:
+            return DatabaseManager._probe_auth(driver)
+        finally:
+            driver.close()
@@ -0,0 +1,202 @@
+# src/codegraphcontext/core/parse_cache.py
+"""
+This module provides an on-disk cache of parse results, keyed by file content,
+so files that have not changed since the last indexing run skip tree-sitter.
+The cache is opt-in: it is only used when CGC_PARSE_CACHE is switched on.
+"""
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..utils.debug_log import debug_log, warning_logger
+
+PARSE_CACHE_DIR = Path.home() / ".codegraphcontext" / "parse-cache"
+VERSION_FILE_NAME = "grammar-version"
+# The cache is off unless this is set to 1, true, yes or on (e.g. in ~/.codegraphcontext/.env).
+PARSE_CACHE_ENV = "CGC_PARSE_CACHE"
+
+# Size limit in megabytes; past it the least recently used entries are evicted.
+PARSE_CACHE_MAX_MB_ENV = "CGC_PARSE_CACHE_MAX_MB"
+DEFAULT_MAX_SIZE_MB = 512
+# The directory is re-measured each time this fraction of the limit has been written.
+EVICTION_CHECK_FRACTION = 10
+# Eviction trims to this fraction of the limit, so the next writes don't trigger it straight away.
+EVICTION_TARGET_FRACTION = 0.9
+
+def _enabled_in_env() -> bool:
+    return os.getenv(PARSE_CACHE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+def _max_size_in_env() -> int:
+    value = os.getenv(PARSE_CACHE_MAX_MB_ENV)
+    try:
+        megabytes = float(value) if value else DEFAULT_MAX_SIZE_MB
+    except ValueError:
+        warning_logger(f"Ignoring invalid {PARSE_CACHE_MAX_MB_ENV}={value!r}")
+        megabytes = DEFAULT_MAX_SIZE_MB
+    return int(megabytes * 1024 * 1024)
+
+def _cache_version() -> str:
+    """
+    Identifies everything that can change a parse result for the same input bytes:
+    the tree-sitter packages and the language parser sources themselves.
+    """
+    parts = []
+    for dist in ("tree-sitter", "tree-sitter-languages"):
+        try:
+            parts.append(f"{dist}=={metadata.version(dist)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{dist}==unknown")
+    digest = hashlib.sha256()
+    languages_dir = Path(__file__).resolve().parent.parent / "tools" / "languages"
+    for source in sorted(languages_dir.glob("*.py")):
+        digest.update(source.read_bytes())
+    parts.append(digest.hexdigest())
+    return "\n".join(parts)
+
+class ParseCache:
+    """
+    Stores pickled parse results under `<root>/<h[:2]>/<h[2:]>.pkl`, where `h` is a SHA-256
+    over the file bytes and the parse options. The whole directory is wiped when the
+    grammar or parser version recorded beside it no longer matches.
+    The directory is kept under `max_size` bytes by evicting the least recently used entries;
+    a hit refreshes its entry's modification time, so mtime order is use order.
+    Cache failures are never fatal: any I/O or unpickling problem is treated as a miss.
+    """
+
+    def __init__(self, root: Path = PARSE_CACHE_DIR, enabled: Optional[bool] = None, max_size: Optional[int] = None):
+        self.root = root
+        # None defers to the environment, read on first use so it can be set after import.
+        self.enabled = enabled
+        self.max_size = max_size
+        self._version_checked = False
+        # Bytes written since the size was last measured. The first measurement waits for a full
+        # slice too, so short-lived processes such as pool workers don't each scan the directory.
+        self._unmeasured_bytes = 0
+
+    def is_enabled(self) -> bool:
+        """Returns whether the cache is switched on and its directory is usable."""
+        if self.enabled is None:
+            self.enabled = _enabled_in_env()
+        return self.enabled and self._ensure_version()
+
+    def _ensure_version(self) -> bool:
+        """Clears the cache if it was written by different grammars; returns False if unusable."""
+        if self._version_checked:
+            return True
+        try:
+            version = _cache_version()
+            version_file = self.root / VERSION_FILE_NAME
+            if not version_file.exists() or version_file.read_text() != version:
+                shutil.rmtree(self.root, ignore_errors=True)
+                self.root.mkdir(parents=True, exist_ok=True)
+                version_file.write_text(version)
+        except OSError as e:
+            warning_logger(f"Parse cache disabled: {e}")
+            return False
+        self._version_checked = True
+        return True
+
+    def key(self, file_path: Path, language_name: str, source: bytes, **options) -> Optional[str]:
+        """
+        Returns the cache key for a file's contents, or None if the cache is off or unusable.
+        Callers pass the bytes they read for parsing, so the file is not read again to hash it.
+        """
+        if not self.is_enabled():
+            return None
+        # The parse result records the file path, so it is part of the key along with the content.
+        digest = hashlib.sha256(source)
+        digest.update(f"\0{language_name}\0{file_path}\0{sorted(options.items())}".encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key[2:]}.pkl"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Returns the cached parse result for the key, if any."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            debug_log(f"[parse_cache] Ignoring unreadable entry {key}: {e}")
+            return None
+        try:
+            # Marks the entry as recently used for eviction.
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Stores a parse result; written to a temporary file first so readers never see partial data."""
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    size = f.tell()
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            debug_log(f"[parse_cache] Could not store entry {key}: {e}")
+            return
+        self._note_written(size)
+
+    def _max_size(self) -> int:
+        if self.max_size is None:
+            self.max_size = _max_size_in_env()
+        return self.max_size
+
+    def _note_written(self, size: int):
+        """Measures the cache each time this process has written another slice of the limit."""
+        self._unmeasured_bytes += size
+        if self._unmeasured_bytes < self._max_size() // EVICTION_CHECK_FRACTION:
+            return
+        self._unmeasured_bytes = 0
+        self.evict()
+
+    def evict(self):
+        """Deletes the least recently used entries if the cache is over its size limit."""
+        max_size = self._max_size()
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.root) as buckets:
+                for bucket in buckets:
+                    if not bucket.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(bucket.path) as bucket_entries:
+                        for entry in bucket_entries:
+                            if entry.name.endswith(".pkl"):
+                                stat = entry.stat(follow_symlinks=False)
+                                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                                total += stat.st_size
+        except OSError as e:
+            debug_log(f"[parse_cache] Could not measure the cache: {e}")
+            return
+        if total <= max_size:
+            return
+
+        target = max_size * EVICTION_TARGET_FRACTION
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                # e.g. already evicted by another process.
+                continue
+            total -= size
+        debug_log(f"[parse_cache] Evicted entries down to {total} bytes")
@@ -50,15 +50,15 @@ class RepositoryEventHandler(FileSystemEventHandler):
     def _initial_scan(self):
         """Scans the entire repository, parses all files, and builds the initial graph."""
         info_logger(f"Performing initial scan for watcher: {self.repo_path}")
-        supported_extensions = self.graph_builder.parsers.keys()
-        all_files = [f for f in self.repo_path.rglob("*") if f.is_file() and f.suffix in supported_extensions]
+        supported_extensions = self.graph_builder.parsers
+        all_files = [f for f in self.repo_path.rglob("*") if f.suffix in supported_extensions and f.is_file()]
         
         # 1. Pre-scan all files to get a global map of where every symbol is defined.
         self.imports_map = self.graph_builder._pre_scan_for_imports(all_files)
         
         # 2. Parse all files in detail and cache the parsed data.
         for f in all_files:
-            parsed_data = self.graph_builder.parse_file(self.repo_path, f)
+            parsed_data = self.graph_builder.parse_file(self.repo_path, f, keep_tree=True)
             if "error" not in parsed_data:
                 self.all_file_data.append(parsed_data)
         
@@ -90,8 +90,8 @@ class RepositoryEventHandler(FileSystemEventHandler):
         modified_path = Path(event_path_str)
 
         # 1. Get all supported files in the repository.
-        supported_extensions = self.graph_builder.parsers.keys()
-        all_files = [f for f in self.repo_path.rglob("*") if f.is_file() and f.suffix in supported_extensions]
+        supported_extensions = self.graph_builder.parsers
+        all_files = [f for f in self.repo_path.rglob("*") if f.suffix in supported_extensions and f.is_file()]
 
         # 2. Re-scan all files to get a fresh, global map of all symbols.
         self.imports_map = self.graph_builder._pre_scan_for_imports(all_files)
@@ -107,7 +107,7 @@ class RepositoryEventHandler(FileSystemEventHandler):
         # This is necessary because a change in one file can affect relationships in others.
         self.all_file_data = []
         for f in all_files:
-            parsed_data = self.graph_builder.parse_file(self.repo_path, f)
+            parsed_data = self.graph_builder.parse_file(self.repo_path, f, keep_tree=True)
             if "error" not in parsed_data:
                 self.all_file_data.append(parsed_data)
         info_logger("Refreshed in-memory cache of all file data.")
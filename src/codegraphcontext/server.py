@@ -7,7 +7,6 @@ import stdlibs
 import sys
 import traceback
 import os
-import re
 from datetime import datetime
 from pathlib import Path
 from neo4j.exceptions import CypherSyntaxError
@@ -23,6 +22,7 @@ from .tools.graph_builder import GraphBuilder
 from .tools.code_finder import CodeFinder
 from .tools.package_resolver import get_local_package_path
 from .utils.debug_log import debug_log, info_logger, error_logger, warning_logger, debug_logger
+from .utils.cypher_safety import STRING_LITERAL_RE, FORBIDDEN_CYPHER_RE
 
 DEFAULT_EDIT_DISTANCE = 2
 DEFAULT_FUZZY_SEARCH = False
@@ -260,20 +260,14 @@ class MCPServer:
 
         # Safety Check: Prevent any write operations to the database.
         # This check first removes all string literals and then checks for forbidden keywords.
-        forbidden_keywords = ['CREATE', 'MERGE', 'DELETE', 'SET', 'REMOVE', 'DROP', 'CALL apoc']
-        
-        # Regex to match single or double quoted strings, handling escaped quotes.
-        string_literal_pattern = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
-        
         # Remove all string literals from the query.
-        query_without_strings = re.sub(string_literal_pattern, '', cypher_query)
+        query_without_strings = STRING_LITERAL_RE.sub('', cypher_query)
         
         # Now, check for forbidden keywords in the query without strings.
-        for keyword in forbidden_keywords:
-            if re.search(r'\b' + keyword + r'\b', query_without_strings, re.IGNORECASE):
-                return {
-                    "error": "This tool only supports read-only queries. Prohibited keywords like CREATE, MERGE, DELETE, SET, etc., are not allowed."
-                }
+        if FORBIDDEN_CYPHER_RE.search(query_without_strings):
+            return {
+                "error": "This tool only supports read-only queries. Prohibited keywords like CREATE, MERGE, DELETE, SET, etc., are not allowed."
+            }
 
         try:
             debug_log(f"Executing Cypher query: {cypher_query}")
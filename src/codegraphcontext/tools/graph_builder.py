@@ -1,19 +1,251 @@
 
 # src/codegraphcontext/tools/graph_builder.py
 import asyncio
+import atexit
+import builtins
+import importlib
+import multiprocessing
+import os
 import pathspec
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Coroutine, Dict, Optional, Tuple
+from typing import Any, Coroutine, Dict, Iterator, Optional, Tuple
 from datetime import datetime
 
 from ..core.database import DatabaseManager
 from ..core.jobs import JobManager, JobStatus
+from ..core.parse_cache import ParseCache
 from ..utils.debug_log import debug_log, info_logger, error_logger, warning_logger
 
 # New imports for tree-sitter
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Tree
 from tree_sitter_languages import get_language
 
+# Tree-sitter language used for each supported file extension.
+PARSER_LANGUAGES = {
+    '.py': 'python',
+    '.ipynb': 'python',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.mjs': 'javascript',
+    '.cjs': 'javascript',
+    '.go': 'go',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.cpp': 'cpp',
+    '.h': 'cpp',
+    '.hpp': 'cpp',
+    '.rs': 'rust',
+    '.c': 'c',
+    # '.h': 'c', # Need to write an algo for distinguishing C vs C++ headers
+    '.java': 'java',
+    '.rb': 'ruby',
+}
+
+# File suffixes that have a parser, for filtering directory listings.
+SUPPORTED_SUFFIXES = frozenset(PARSER_LANGUAGES)
+
+# Number of recently parsed trees kept per parser for incremental reparsing.
+TREE_CACHE_SIZE = 512
+
+# Below this many files, parsing stays in-process since starting worker processes costs more.
+PARALLEL_PARSE_MIN_FILES = 32
+
+# Files handed to a worker process per task, amortizing the inter-process round-trip.
+PARSE_CHUNK_SIZE = 16
+
+# Languages whose import-map entries are read from their main-pass parse results rather than
+# found by a separate pre-scan; their modules provide `definition_names_<lang>(file_data)`.
+PARSE_INDEXED_LANGUAGES = frozenset({'c'})
+
+# Names of Python builtins; calls to these are never linked to indexed functions.
+_BUILTINS = frozenset(vars(builtins))
+
+# Maximum number of rows sent with a single UNWIND query.
+UNWIND_BATCH_SIZE = 1000
+
+# Parsed files written to the graph per transaction during a build.
+FILE_WRITE_BATCH_SIZE = 100
+
+# Static Cypher statements, kept at module level so each run reuses the same string object.
+MERGE_REPOSITORY_QUERY = """
+    MERGE (r:Repository {path: $path})
+    SET r.name = $name, r.is_dependency = $is_dependency
+"""
+
+MERGE_FILES_QUERY = """
+    UNWIND $rows AS row
+    MERGE (f:File {path: row.path})
+    SET f.name = row.name, f.relative_path = row.relative_path, f.is_dependency = row.is_dependency
+"""
+
+MERGE_PARAMETERS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (fn:Function {name: row.func_name, file_path: row.file_path, line_number: row.line_number})
+    MERGE (p:Parameter {name: row.arg_name, file_path: row.file_path, function_line_number: row.line_number})
+    MERGE (fn)-[:HAS_PARAMETER]->(p)
+"""
+
+LINK_NESTED_FUNCTIONS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (outer:Function {name: row.context, file_path: row.file_path})
+    MATCH (inner:Function {name: row.name, file_path: row.file_path, line_number: row.line_number})
+    MERGE (outer)-[:CONTAINS]->(inner)
+"""
+
+MERGE_JS_IMPORTS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (f:File {path: row.file_path})
+    MERGE (m:Module {name: row.module_name})
+    MERGE (f)-[r:IMPORTS]->(m)
+    SET r += row.props
+"""
+
+MERGE_IMPORTS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (f:File {path: row.file_path})
+    MERGE (m:Module {name: row.name})
+    SET m.alias = row.alias,
+        m.full_import_name = coalesce(row.full_import_name, m.full_import_name)
+    MERGE (f)-[:IMPORTS]->(m)
+"""
+
+LINK_CLASS_MEMBERS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (c:Class {name: row.class_name, file_path: row.file_path})
+    MATCH (fn:Function {name: row.func_name, file_path: row.file_path, line_number: row.func_line})
+    MERGE (c)-[:CONTAINS]->(fn)
+"""
+
+MERGE_FUNCTION_CALLS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (caller:Function {name: row.caller_name, file_path: row.caller_file_path, line_number: row.caller_line_number})
+    MATCH (called:Function {name: row.called_name, file_path: row.called_file_path})
+    MERGE (caller)-[:CALLS {line_number: row.line_number, args: row.args, full_call_name: row.full_call_name}]->(called)
+"""
+
+MERGE_FILE_CALLS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (caller:File {path: row.caller_file_path})
+    MATCH (called:Function {name: row.called_name, file_path: row.called_file_path})
+    MERGE (caller)-[:CALLS {line_number: row.line_number, args: row.args, full_call_name: row.full_call_name}]->(called)
+"""
+
+MERGE_INHERITANCE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (child:Class {name: row.child_name, file_path: row.file_path})
+    MATCH (parent:Class {name: row.parent_name, file_path: row.resolved_parent_file_path})
+    MERGE (child)-[:INHERITS]->(parent)
+"""
+
+# Deletes a file, its elements and the ancestor directories it leaves empty, in one statement.
+# Walking up from the file, a directory is left empty exactly when it contains only the branch
+# being removed, so the orphans are the directories below the first one holding anything else.
+# They are listed, and deleted, deepest first.
+DELETE_FILE_QUERY = """
+    MATCH (f:File {path: $path})
+    OPTIONAL MATCH chain = (f)<-[:CONTAINS*]-(top:Directory)
+    WHERE NOT (top)<-[:CONTAINS]-(:Directory)
+    WITH f, CASE WHEN chain IS NULL THEN [] ELSE nodes(chain)[1..] END AS dirs
+    WITH f, [i IN range(0, size(dirs) - 1)
+             WHERE all(d IN dirs[..i + 1] WHERE size([(d)-[:CONTAINS]->(c) | c]) = 1) | dirs[i]] AS orphans
+    OPTIONAL MATCH (f)-[:CONTAINS]->(element)
+    DETACH DELETE f, element
+    WITH DISTINCT orphans
+    UNWIND orphans AS d
+    DETACH DELETE d
+"""
+
+DELETE_REPOSITORY_QUERY = """
+    MATCH (r:Repository {path: $path})
+    OPTIONAL MATCH (r)-[:CONTAINS*]->(e)
+    DETACH DELETE r, e
+"""
+
+@lru_cache(maxsize=None)
+def _merge_contained_nodes_query(label: str) -> str:
+    """
+    Returns the UNWIND query that merges files' contained nodes of one label.
+    Labels can't be query parameters, so the text is built once per label and reused,
+    keeping one stable statement (and one cached plan) per label.
+    """
+    return f"""
+        UNWIND $rows AS row
+        MATCH (f:File {{path: row.file_path}})
+        MERGE (n:{label} {{name: row.name, file_path: row.file_path, line_number: row.line_number}})
+        SET n += row.props
+        MERGE (f)-[:CONTAINS]->(n)
+    """
+
+@lru_cache(maxsize=None)
+def _merge_directories_query(parent_label: str) -> str:
+    """Returns the UNWIND query merging directories under their parent Repository or Directory."""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (p:{parent_label} {{path: row.parent_path}})
+        MERGE (d:Directory {{path: row.path}})
+        SET d.name = row.name
+        MERGE (p)-[:CONTAINS]->(d)
+    """
+
+@lru_cache(maxsize=None)
+def _link_files_query(parent_label: str) -> str:
+    """Returns the UNWIND query linking files to their parent Repository or Directory."""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (p:{parent_label} {{path: row.parent_path}})
+        MATCH (f:File {{path: row.file_path}})
+        MERGE (p)-[:CONTAINS]->(f)
+    """
+
+def _run_unwind(runner, query: str, rows: list, **params):
+    """
+    Runs an `UNWIND $rows` query in batches on a session or transaction,
+    skipping the round-trip when there is nothing to write.
+    """
+    for start in range(0, len(rows), UNWIND_BATCH_SIZE):
+        runner.run(query, rows=rows[start:start + UNWIND_BATCH_SIZE], **params)
+
+# Shared by every parser in this process; worker processes get their own instance.
+_parse_cache = ParseCache()
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    """Length of the common prefix of two byte strings, using slice comparisons (memcmp)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _point_at(source: bytes, offset: int) -> Tuple[int, int]:
+    """Converts a byte offset into the (row, column) point tree-sitter expects."""
+    row = source.count(b"\n", 0, offset)
+    column = offset - (source.rfind(b"\n", 0, offset) + 1)
+    return row, column
+
+def _edit_tree(tree: Tree, old_source: bytes, new_source: bytes):
+    """Describes the single changed region between two versions of a source to the old tree."""
+    start = _common_prefix_len(old_source, new_source)
+    # The common suffix must not overlap the common prefix in either version.
+    max_suffix = min(len(old_source), len(new_source)) - start
+    suffix = _common_prefix_len(old_source[::-1][:max_suffix], new_source[::-1][:max_suffix])
+    old_end = len(old_source) - suffix
+    new_end = len(new_source) - suffix
+    tree.edit(
+        start_byte=start,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_point_at(old_source, start),
+        old_end_point=_point_at(old_source, old_end),
+        new_end_point=_point_at(new_source, new_end),
+    )
+
 class TreeSitterParser:
     """A generic parser wrapper for a specific language using tree-sitter."""
 
@@ -22,6 +254,8 @@ class TreeSitterParser:
         self.language: Language = get_language(language_name)
         self.parser = Parser()
         self.parser.set_language(self.language)
+        # file path -> (source bytes, tree) of the last parse, most recently used last.
+        self._tree_cache: "OrderedDict[str, Tuple[bytes, Tree]]" = OrderedDict()
 
         self.language_specific_parser = None
         if self.language_name == 'python':
@@ -53,13 +287,277 @@ class TreeSitterParser:
             self.language_specific_parser = RubyTreeSitterParser(self)
 
 
-    def parse(self, file_path: Path, is_dependency: bool = False, **kwargs) -> Dict:
-        """Dispatches parsing to the language-specific parser."""
-        if self.language_specific_parser:
-            return self.language_specific_parser.parse(file_path, is_dependency, **kwargs)
+    def parse_tree(self, source_bytes: bytes, file_path: Optional[Path] = None, keep_tree: bool = False) -> Tree:
+        """
+        Parses source bytes into a tree. If this file's tree was kept from an earlier parse, it is
+        edited to match the new content and reused, so tree-sitter only reparses the changed region.
+        Trees are only kept for files parsed with `keep_tree`, i.e. those the watcher re-parses;
+        a full build parses each file once and would only fill memory with them.
+        """
+        if file_path is None:
+            return self.parser.parse(source_bytes)
+
+        key = str(file_path)
+        previous = self._tree_cache.pop(key, None)
+        if previous is None:
+            tree = self.parser.parse(source_bytes)
+            if not keep_tree:
+                return tree
         else:
+            old_source, old_tree = previous
+            if old_source == source_bytes:
+                tree = old_tree
+            else:
+                _edit_tree(old_tree, old_source, source_bytes)
+                tree = self.parser.parse(source_bytes, old_tree)
+
+        self._tree_cache[key] = (source_bytes, tree)
+        if len(self._tree_cache) > TREE_CACHE_SIZE:
+            self._tree_cache.popitem(last=False)
+        return tree
+
+    def read_text(self, file_path: Path, source: Optional[bytes] = None, errors: str = "strict") -> str:
+        """
+        Returns a file's text as `open(file_path, encoding="utf-8", errors=errors).read()` would.
+        `source` is the file's bytes when the caller already has them, so the file isn't read twice.
+        """
+        if source is None:
+            source = file_path.read_bytes()
+        text = source.decode("utf-8", errors)
+        # Text mode translates \r\n and lone \r line endings to \n.
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def parse(self, file_path: Path, is_dependency: bool = False, keep_tree: bool = False, **kwargs) -> Dict:
+        """
+        Dispatches parsing to the language-specific parser.
+        Results for files whose content is unchanged are served from the on-disk parse cache.
+        `keep_tree` keeps the file's tree so a later re-parse of it can be incremental.
+        """
+        if not self.language_specific_parser:
             raise NotImplementedError(f"No language-specific parser implemented for {self.language_name}")
 
+        try:
+            source = file_path.read_bytes()
+        except OSError:
+            # Left to the language parser, which reports the error in its own way.
+            source = None
+
+        cache_key = None
+        if source is not None:
+            cache_key = _parse_cache.key(file_path, self.language_name, source, is_dependency=is_dependency, **kwargs)
+            if cache_key:
+                cached = _parse_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+        # The bytes read for the cache key are handed on so the language parser doesn't read the file again.
+        result = self.language_specific_parser.parse(
+            file_path, is_dependency, source=source, keep_tree=keep_tree, **kwargs
+        )
+        if cache_key and "error" not in result:
+            _parse_cache.put(cache_key, result)
+        return result
+
+def _parse_with(parser: TreeSitterParser, repo_path: Path, file_path: Path, is_dependency: bool = False,
+                keep_tree: bool = False) -> Dict:
+    """Parses a file with the given parser, returning an error dict instead of raising."""
+    debug_log(f"[parse_file] Starting parsing for: {file_path} with {parser.language_name} parser")
+    try:
+        if parser.language_name == 'python':
+            is_notebook = file_path.suffix == '.ipynb'
+            file_data = parser.parse(file_path, is_dependency, keep_tree=keep_tree, is_notebook=is_notebook)
+        else:
+            file_data = parser.parse(file_path, is_dependency, keep_tree=keep_tree)
+        file_data['repo_path'] = str(repo_path)
+        debug_log(f"[parse_file] Successfully parsed: {file_path}")
+        return file_data
+
+    except Exception as e:
+        error_logger(f"Error parsing {file_path} with {parser.language_name} parser: {e}")
+        debug_log(f"[parse_file] Error parsing {file_path}: {e}")
+        return {"file_path": str(file_path), "error": str(e)}
+
+class LazyParserMap(Mapping):
+    """
+    Maps each supported file extension to its TreeSitterParser, loading a language's grammar
+    and parser module only when a file of that language is first parsed.
+    Extensions of the same language share one parser.
+    A language whose grammar or parser fails to load raises on every lookup, without retrying.
+    """
+
+    def __init__(self):
+        self._by_language: Dict[str, TreeSitterParser] = {}
+        self._load_errors: Dict[str, Exception] = {}
+
+    def for_language(self, lang: str) -> TreeSitterParser:
+        """Returns the parser for a language name, creating it on first use."""
+        parser = self._by_language.get(lang)
+        if parser is None:
+            if lang in self._load_errors:
+                raise RuntimeError(f"The {lang} parser could not be loaded: {self._load_errors[lang]}")
+            try:
+                parser = self._by_language[lang] = TreeSitterParser(lang)
+            except Exception as e:
+                self._load_errors[lang] = e
+                raise RuntimeError(f"The {lang} parser could not be loaded: {e}") from e
+        return parser
+
+    def __getitem__(self, ext: str) -> TreeSitterParser:
+        return self.for_language(PARSER_LANGUAGES[ext])
+
+    def __contains__(self, ext: object) -> bool:
+        # Answered from the extension table so membership checks never load a grammar.
+        return ext in SUPPORTED_SUFFIXES
+
+    def __iter__(self):
+        return iter(PARSER_LANGUAGES)
+
+    def __len__(self) -> int:
+        return len(PARSER_LANGUAGES)
+
+def _parse_path(parsers: LazyParserMap, repo_path: Path, file_path: Path, is_dependency: bool = False,
+                keep_tree: bool = False) -> Dict:
+    """
+    Parses a file with the parser for its extension. Like a parse failure, a missing parser or
+    one that can't be loaded fails only this file, with an error dict.
+    """
+    try:
+        parser = parsers.get(file_path.suffix)
+    except Exception as e:
+        error_logger(f"Skipping {file_path}: {e}")
+        return {"file_path": str(file_path), "error": str(e)}
+    if not parser:
+        warning_logger(f"No parser found for file extension {file_path.suffix}. Skipping {file_path}")
+        return {"file_path": str(file_path), "error": f"No parser for {file_path.suffix}"}
+
+    return _parse_with(parser, repo_path, file_path, is_dependency, keep_tree)
+
+def _pre_scan_language(parsers: LazyParserMap, lang: str, files: list[Path]) -> dict:
+    """Pre-scans one language's files, or maps nothing for them if its parser can't be loaded."""
+    try:
+        parser = parsers.for_language(lang)
+    except Exception as e:
+        error_logger(f"Skipping the {lang} pre-scan: {e}")
+        return {}
+    return _pre_scan(lang, files, parser)
+
+# Parsers created inside a worker process, reused for every file that process handles.
+_worker_parsers = LazyParserMap()
+
+def _parse_in_worker(task: Tuple[Path, Path, bool]) -> Dict:
+    """Worker-process entry point for parallel parsing."""
+    repo_path, file_path, is_dependency = task
+    return _parse_path(_worker_parsers, repo_path, file_path, is_dependency)
+
+def _parse_chunk_in_worker(tasks: list[Tuple[Path, Path, bool]]) -> list[Dict]:
+    """Worker-process entry point parsing a run of files in one round-trip."""
+    return [_parse_in_worker(task) for task in tasks]
+
+def _iter_source_files(root: Path, spec: Optional[pathspec.PathSpec] = None) -> Iterator[Path]:
+    """
+    Yields the files under `root` that have a parser, in the same order as `root.rglob("*")`,
+    leaving out paths the ignore spec matches.
+    Uses `os.scandir`, whose entries know their own type, so only symlinks cost a stat call,
+    and a Path is built only for files that are kept. Ignored directories are not descended
+    into, unless the spec has negated patterns that could re-include something below them.
+    """
+    prune_dirs = spec is not None and all(pattern.include is not False for pattern in spec.patterns)
+    stack = [(str(root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    rel_path = f"{rel_dir}{os.sep}{name}" if rel_dir else name
+                    try:
+                        # Like rglob, symlinked directories are not followed but symlinked files are kept.
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (prune_dirs and spec.match_file(rel_path + "/")):
+                                subdirs.append((entry.path, rel_path))
+                            continue
+                        dot = name.rfind(".")
+                        if dot <= 0 or name[dot:] not in SUPPORTED_SUFFIXES or not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    if spec is None or not spec.match_file(rel_path):
+                        yield Path(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as rglob does.
+            continue
+        stack.extend(reversed(subdirs))
+
+def _read_source(file_path: Path) -> Optional[bytes]:
+    """Returns a file's bytes, or None if it can't be read."""
+    try:
+        return file_path.read_bytes()
+    except OSError:
+        return None
+
+def _pre_scan(lang: str, files: list[Path], parser: TreeSitterParser) -> dict:
+    """
+    Runs the `pre_scan_<lang>` function of the language module to map names to file paths.
+    Each file's (name, path) entries are kept in the on-disk parse cache, keyed by content,
+    so only new or changed files are scanned; unchanged repositories skip the scan entirely.
+    Each file is read once: the bytes hashed for its cache key are the ones scanned on a miss.
+    """
+    lang_module = importlib.import_module(f".languages.{lang}", __package__)
+    pre_scan = getattr(lang_module, f"pre_scan_{lang}")
+
+    if _parse_cache.is_enabled():
+        sources = [_read_source(file) for file in files]
+        keys = [
+            _parse_cache.key(file, lang, source, pre_scan=True) if source is not None else None
+            for file, source in zip(files, sources)
+        ]
+    else:
+        # Without the cache nothing needs the bytes up front; the scanner reads each file itself.
+        sources = keys = [None] * len(files)
+    entries_by_file = [_parse_cache.get(key) if key else None for key in keys]
+    # Bytes of cache hits aren't scanned, so they aren't held on to either.
+    sources = [source if entries is None else None for source, entries in zip(sources, entries_by_file)]
+    missing = [i for i, entries in enumerate(entries_by_file) if entries is None]
+    if missing:
+        scanned = pre_scan([files[i] for i in missing], parser, [sources[i] for i in missing])
+
+        # Scanners report the file's path as given or resolved; map both back to the file.
+        owner_by_path: Dict[str, Optional[int]] = {}
+        for i in missing:
+            for path in {str(files[i]), str(files[i].resolve())}:
+                # A path shared by two files (e.g. through a symlink) can't be attributed.
+                owner_by_path[path] = None if path in owner_by_path else i
+        new_entries: Dict[int, list] = {i: [] for i in missing}
+        for name, paths in scanned.items():
+            for path in paths:
+                owner = owner_by_path.get(path)
+                if owner is None:
+                    # Rare enough to simply scan everything, uncached.
+                    return scanned if len(missing) == len(files) else pre_scan(files, parser, sources)
+                new_entries[owner].append((name, path))
+
+        for i, entries in new_entries.items():
+            entries_by_file[i] = entries
+            if keys[i]:
+                _parse_cache.put(keys[i], entries)
+
+    # Rebuilt file by file, this gives the same names and path order as one scan of all files.
+    imports_map = {}
+    for entries in entries_by_file:
+        for name, path in entries:
+            imports_map.setdefault(name, []).append(path)
+    return imports_map
+
+def _definition_names(lang: str, file_data: Dict) -> list[str]:
+    """Runs the `definition_names_<lang>` function of the language module on a parse result."""
+    lang_module = importlib.import_module(f".languages.{lang}", __package__)
+    return getattr(lang_module, f"definition_names_{lang}")(file_data)
+
+def _pre_scan_in_worker(lang: str, files: list[Path]) -> dict:
+    """Worker-process entry point for scanning one language's files in parallel."""
+    return _pre_scan_language(_worker_parsers, lang, files)
+
 class GraphBuilder:
     """Module for building and managing the Neo4j code graph."""
 
@@ -68,27 +566,51 @@ class GraphBuilder:
         self.job_manager = job_manager
         self.loop = loop
         self.driver = self.db_manager.get_driver()
-        self.parsers = {
-            '.py': TreeSitterParser('python'),
-            '.ipynb': TreeSitterParser('python'),
-            '.js': TreeSitterParser('javascript'),
-            '.jsx': TreeSitterParser('javascript'),
-            '.mjs': TreeSitterParser('javascript'),
-            '.cjs': TreeSitterParser('javascript'),
-            '.go': TreeSitterParser('go'),
-            '.ts': TreeSitterParser('typescript'),
-            '.tsx': TreeSitterParser('typescript'),
-            '.cpp': TreeSitterParser('cpp'),
-            '.h': TreeSitterParser('cpp'),
-            '.hpp': TreeSitterParser('cpp'),
-            '.rs': TreeSitterParser('rust'),
-            '.c': TreeSitterParser('c'),
-            # '.h': TreeSitterParser('c'), # Need to write an algo for distinguishing C vs C++ headers
-            '.java': TreeSitterParser('java'),
-            '.rb': TreeSitterParser('ruby')
-        }
+        self.parsers = LazyParserMap()
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # (name, full import name) -> resolved file path, rebuilt for each linking pass.
+        self._import_path_index: Dict[Tuple[str, str], Optional[str]] = {}
         self.create_schema()
 
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Returns the worker pool used for parsing, starting it on first use."""
+        if self._parse_pool is None:
+            # Spawned rather than forked workers, since the driver and file watcher run threads.
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            # Shut the workers down before interpreter teardown rather than leaving it to GC.
+            atexit.register(self._parse_pool.shutdown)
+        return self._parse_pool
+
+    async def _aiter_parsed_files(self, tasks: list[Tuple[Path, Path, bool]]):
+        """
+        Yields the parse result for each (repo_path, file_path, is_dependency) task, in order.
+        Tree-sitter parsing is CPU-bound, so large batches are spread across worker processes;
+        either way the event loop awaits the results instead of blocking on them.
+        """
+        if len(tasks) < PARALLEL_PARSE_MIN_FILES or (os.cpu_count() or 1) < 2:
+            # One file at a time: the in-process parsers and their tree caches are not thread-safe.
+            for repo_path, file_path, is_dependency in tasks:
+                yield await asyncio.to_thread(self.parse_file, repo_path, file_path, is_dependency)
+            return
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_parse_pool()
+        chunks = [
+            loop.run_in_executor(pool, _parse_chunk_in_worker, tasks[start:start + PARSE_CHUNK_SIZE])
+            for start in range(0, len(tasks), PARSE_CHUNK_SIZE)
+        ]
+        try:
+            for chunk in chunks:
+                for file_data in await chunk:
+                    yield file_data
+        finally:
+            # Drop work that hasn't started if the build stops early.
+            for chunk in chunks:
+                chunk.cancel()
+
     # A general schema creation based on common features across languages
     def create_schema(self):
         """Create constraints and indexes in Neo4j."""
@@ -114,6 +636,11 @@ class GraphBuilder:
                 session.run("CREATE INDEX function_lang IF NOT EXISTS FOR (f:Function) ON (f.lang)")
                 session.run("CREATE INDEX class_lang IF NOT EXISTS FOR (c:Class) ON (c.lang)")
                 session.run("CREATE INDEX annotation_lang IF NOT EXISTS FOR (a:Annotation) ON (a.lang)")
+
+                # Edge creation matches functions and classes on (name, file_path) without the
+                # line number, which the three-part uniqueness constraints can't serve on their own.
+                session.run("CREATE INDEX function_name_path IF NOT EXISTS FOR (f:Function) ON (f.name, f.file_path)")
+                session.run("CREATE INDEX class_name_path IF NOT EXISTS FOR (c:Class) ON (c.name, c.file_path)")
                 session.run("""
                     CREATE FULLTEXT INDEX code_search_index IF NOT EXISTS 
                     FOR (n:Function|Class|Variable) 
@@ -125,67 +652,45 @@ class GraphBuilder:
                 warning_logger(f"Schema creation warning: {e}")
 
 
-    def _pre_scan_for_imports(self, files: list[Path]) -> dict:
-        """Dispatches pre-scan to the correct language-specific implementation."""
+    def _pre_scan_for_imports(self, files: list[Path], skip_languages: frozenset = frozenset()) -> dict:
+        """
+        Dispatches pre-scan to the correct language-specific implementation.
+        Files of `skip_languages` are left out, for callers that map them from parse results.
+        """
         imports_map = {}
         
-        # Group files by language/extension
+        # Group files by language, so e.g. .js and .jsx files share one scan
         files_by_lang = {}
         for file in files:
-            if file.suffix in self.parsers:
-                lang_ext = file.suffix
-                if lang_ext not in files_by_lang:
-                    files_by_lang[lang_ext] = []
-                files_by_lang[lang_ext].append(file)
-
-        if '.py' in files_by_lang:
-            from .languages import python as python_lang_module
-            imports_map.update(python_lang_module.pre_scan_python(files_by_lang['.py'], self.parsers['.py']))
-        elif '.ipynb' in files_by_lang:
-            from .languages import python as python_lang_module
-            imports_map.update(python_lang_module.pre_scan_python(files_by_lang['.ipynb'], self.parsers['.ipynb']))
-        elif '.js' in files_by_lang:
-            from .languages import javascript as js_lang_module
-            imports_map.update(js_lang_module.pre_scan_javascript(files_by_lang['.js'], self.parsers['.js']))
-        elif '.jsx' in files_by_lang:
-            from .languages import javascript as js_lang_module
-            imports_map.update(js_lang_module.pre_scan_javascript(files_by_lang['.jsx'], self.parsers['.jsx']))
-        elif '.mjs' in files_by_lang:
-            from .languages import javascript as js_lang_module
-            imports_map.update(js_lang_module.pre_scan_javascript(files_by_lang['.mjs'], self.parsers['.mjs']))
-        elif '.cjs' in files_by_lang:
-            from .languages import javascript as js_lang_module
-            imports_map.update(js_lang_module.pre_scan_javascript(files_by_lang['.cjs'], self.parsers['.cjs']))
-        elif '.go' in files_by_lang:
-             from .languages import go as go_lang_module
-             imports_map.update(go_lang_module.pre_scan_go(files_by_lang['.go'], self.parsers['.go']))
-        elif '.ts' in files_by_lang:
-            from .languages import typescript as ts_lang_module
-            imports_map.update(ts_lang_module.pre_scan_typescript(files_by_lang['.ts'], self.parsers['.ts']))
-        elif '.tsx' in files_by_lang:
-            from .languages import typescript as ts_lang_module
-            imports_map.update(ts_lang_module.pre_scan_typescript(files_by_lang['.tsx'], self.parsers['.tsx']))
-        elif '.cpp' in files_by_lang:
-            from .languages import cpp as cpp_lang_module
-            imports_map.update(cpp_lang_module.pre_scan_cpp(files_by_lang['.cpp'], self.parsers['.cpp']))
-        elif '.h' in files_by_lang:
-            from .languages import cpp as cpp_lang_module
-            imports_map.update(cpp_lang_module.pre_scan_cpp(files_by_lang['.h'], self.parsers['.h']))
-        elif '.hpp' in files_by_lang:
-            from .languages import cpp as cpp_lang_module
-            imports_map.update(cpp_lang_module.pre_scan_cpp(files_by_lang['.hpp'], self.parsers['.hpp']))
-        elif '.rs' in files_by_lang:
-            from .languages import rust as rust_lang_module
-            imports_map.update(rust_lang_module.pre_scan_rust(files_by_lang['.rs'], self.parsers['.rs']))
-        elif '.c' in files_by_lang:
-            from .languages import c as c_lang_module
-            imports_map.update(c_lang_module.pre_scan_c(files_by_lang['.c'], self.parsers['.c']))
-        elif '.java' in files_by_lang:
-            from .languages import java as java_lang_module
-            imports_map.update(java_lang_module.pre_scan_java(files_by_lang['.java'], self.parsers['.java']))
-        elif '.rb' in files_by_lang:
-            from .languages import ruby as ruby_lang_module
-            imports_map.update(ruby_lang_module.pre_scan_ruby(files_by_lang['.rb'], self.parsers['.rb']))
+            lang = PARSER_LANGUAGES.get(file.suffix)
+            if lang is not None and lang not in skip_languages:
+                if lang not in files_by_lang:
+                    files_by_lang[lang] = []
+                files_by_lang[lang].append(file)
+        scan_count = sum(len(lang_files) for lang_files in files_by_lang.values())
+
+        if scan_count >= PARALLEL_PARSE_MIN_FILES and (os.cpu_count() or 1) >= 2:
+            # Each language's files are split into chunks so one large language is spread
+            # over all workers. Chunk results come back in order, so merging them gives
+            # the same map as scanning each language whole.
+            chunks = [
+                (lang, lang_files[start:start + PARSE_CHUNK_SIZE])
+                for lang, lang_files in files_by_lang.items()
+                for start in range(0, len(lang_files), PARSE_CHUNK_SIZE)
+            ]
+            results = self._get_parse_pool().map(
+                _pre_scan_in_worker, [lang for lang, _ in chunks], [chunk for _, chunk in chunks]
+            )
+        else:
+            results = (
+                _pre_scan_language(self.parsers, lang, lang_files)
+                for lang, lang_files in files_by_lang.items()
+            )
+
+        # Every language is scanned and merged; a name defined in several languages keeps all its paths.
+        for lang_map in results:
+            for name, paths in lang_map.items():
+                imports_map.setdefault(name, []).extend(paths)
             
         return imports_map
 
@@ -196,10 +701,7 @@ class GraphBuilder:
         repo_path_str = str(repo_path.resolve())
         with self.driver.session() as session:
             session.run(
-                """
-                MERGE (r:Repository {path: $path})
-                SET r.name = $name, r.is_dependency = $is_dependency
-                """,
+                MERGE_REPOSITORY_QUERY,
                 path=repo_path_str,
                 name=repo_name,
                 is_dependency=is_dependency,
@@ -207,52 +709,58 @@ class GraphBuilder:
 
     # First pass to add file and its contents
     def add_file_to_graph(self, file_data: Dict, repo_name: str, imports_map: dict):
-        info_logger("Executing add_file_to_graph with my change!")
         """Adds a file and its contents within a single, unified session."""
-        file_path_str = str(Path(file_data['file_path']).resolve())
-        file_name = Path(file_path_str).name
-        is_dependency = file_data.get('is_dependency', False)
+        self.add_files_to_graph([file_data], repo_name, imports_map)
 
-        with self.driver.session() as session:
+    def add_files_to_graph(self, all_file_data: list[Dict], repo_name: str, imports_map: dict):
+        """
+        Adds several files and their contents in one transaction. Rows from every file are
+        gathered per query first, so each query runs once for the whole batch of files.
+        """
+        file_rows = []
+        # Directories one list per depth below the repository, so each level is merged after its parents.
+        directory_levels: list[list] = []
+        seen_directories = set()
+        file_link_rows = {'Repository': [], 'Directory': []}
+        node_rows: Dict[str, list] = {}
+        parameter_rows = []
+        nested_rows = []
+        js_import_rows = []
+        import_rows = []
+        class_member_rows = []
+
+        for file_data in all_file_data:
+            # Resolve each path once; resolve() stats the filesystem.
+            file_path_obj = Path(file_data['file_path']).resolve()
+            file_path_str = str(file_path_obj)
+            file_name = file_path_obj.name
+            # The Repository node is keyed by this same resolved path, so it needs no lookup query.
+            repo_path_obj = Path(file_data['repo_path']).resolve()
+            is_dependency = file_data.get('is_dependency', False)
             try:
-                # Match repository by path, not name, to avoid conflicts with same-named folders at different locations
-                repo_result = session.run("MATCH (r:Repository {path: $repo_path}) RETURN r.path as path", repo_path=str(Path(file_data['repo_path']).resolve())).single()
-                relative_path = str(Path(file_path_str).relative_to(Path(repo_result['path']))) if repo_result else file_name
+                relative_path = str(file_path_obj.relative_to(repo_path_obj))
             except ValueError:
                 relative_path = file_name
 
-            session.run("""
-                MERGE (f:File {path: $path})
-                SET f.name = $name, f.relative_path = $relative_path, f.is_dependency = $is_dependency
-            """, path=file_path_str, name=file_name, relative_path=relative_path, is_dependency=is_dependency)
+            file_rows.append({'path': file_path_str, 'name': file_name, 'relative_path': relative_path, 'is_dependency': is_dependency})
 
-            file_path_obj = Path(file_path_str)
-            repo_path_obj = Path(repo_result['path'])
-            
-            relative_path_to_file = file_path_obj.relative_to(repo_path_obj)
-            
             parent_path = str(repo_path_obj)
             parent_label = 'Repository'
 
-            for part in relative_path_to_file.parts[:-1]:
-                current_path = Path(parent_path) / part
-                current_path_str = str(current_path)
-                
-                session.run(f"""
-                    MATCH (p:{parent_label} {{path: $parent_path}})
-                    MERGE (d:Directory {{path: $current_path}})
-                    SET d.name = $part
-                    MERGE (p)-[:CONTAINS]->(d)
-                """, parent_path=parent_path, current_path=current_path_str, part=part)
-
+            # Both paths are resolved, so the directory chain is built with plain string joins
+            # rather than a Path object per component. Directories shared by several files in
+            # the batch are merged once; a parent is always seen before its children.
+            for depth, part in enumerate(relative_path.split(os.sep)[:-1]):
+                current_path_str = parent_path.rstrip(os.sep) + os.sep + part
+                if current_path_str not in seen_directories:
+                    seen_directories.add(current_path_str)
+                    if depth == len(directory_levels):
+                        directory_levels.append([])
+                    directory_levels[depth].append({'parent_path': parent_path, 'path': current_path_str, 'name': part})
                 parent_path = current_path_str
                 parent_label = 'Directory'
 
-            session.run(f"""
-                MATCH (p:{parent_label} {{path: $parent_path}})
-                MATCH (f:File {{path: $file_path}})
-                MERGE (p)-[:CONTAINS]->(f)
-            """, parent_path=parent_path, file_path=file_path_str)
+            file_link_rows[parent_label].append({'parent_path': parent_path, 'file_path': file_path_str})
 
             # CONTAINS relationships for functions, classes, and variables
             # To add a new language-specific node type (e.g., 'Trait' for Rust):
@@ -270,41 +778,33 @@ class GraphBuilder:
                 (file_data.get('enums',[]), 'Enum'),
                 (file_data.get('unions',[]), 'Union'),
             ]
+            # Each label and relationship kind is written with one UNWIND query instead of
+            # one round-trip per item.
             for item_data, label in item_mappings:
+                rows = node_rows.setdefault(label, [])
                 for item in item_data:
                     # Ensure cyclomatic_complexity is set for functions
                     if label == 'Function' and 'cyclomatic_complexity' not in item:
                         item['cyclomatic_complexity'] = 1 # Default value
+                    rows.append({'file_path': file_path_str, 'name': item['name'], 'line_number': item['line_number'], 'props': item})
 
-                    query = f"""
-                        MATCH (f:File {{path: $file_path}})
-                        MERGE (n:{label} {{name: $name, file_path: $file_path, line_number: $line_number}})
-                        SET n += $props
-                        MERGE (f)-[:CONTAINS]->(n)
-                    """
-                    session.run(query, file_path=file_path_str, name=item['name'], line_number=item['line_number'], props=item)
-                    
-                    if label == 'Function':
-                        for arg_name in item.get('args', []):
-                            session.run("""
-                                MATCH (fn:Function {name: $func_name, file_path: $file_path, line_number: $line_number})
-                                MERGE (p:Parameter {name: $arg_name, file_path: $file_path, function_line_number: $line_number})
-                                MERGE (fn)-[:HAS_PARAMETER]->(p)
-                            """, func_name=item['name'], file_path=file_path_str, line_number=item['line_number'], arg_name=arg_name)
+            parameter_rows.extend(
+                {'file_path': file_path_str, 'func_name': item['name'], 'line_number': item['line_number'], 'arg_name': arg_name}
+                for item in file_data.get('functions', [])
+                for arg_name in item.get('args', [])
+            )
 
             # Create CONTAINS relationships for nested functions
-            for item in file_data.get('functions', []):
-                if item.get("context_type") == "function_definition":
-                    session.run("""
-                        MATCH (outer:Function {name: $context, file_path: $file_path})
-                        MATCH (inner:Function {name: $name, file_path: $file_path, line_number: $line_number})
-                        MERGE (outer)-[:CONTAINS]->(inner)
-                    """, context=item["context"], file_path=file_path_str, name=item["name"], line_number=item["line_number"])
+            nested_rows.extend(
+                {'file_path': file_path_str, 'context': item["context"], 'name': item["name"], 'line_number': item["line_number"]}
+                for item in file_data.get('functions', [])
+                if item.get("context_type") == "function_definition"
+            )
 
             # Handle imports and create IMPORTS relationships
+            lang = file_data.get('lang')
             for imp in file_data.get('imports', []):
                 info_logger(f"Processing import: {imp}")
-                lang = file_data.get('lang')
                 if lang == 'javascript':
                     # New, correct logic for JS
                     module_name = imp.get('source')
@@ -314,46 +814,68 @@ class GraphBuilder:
                     rel_props = {'imported_name': imp.get('name', '*')}
                     if imp.get('alias'):
                         rel_props['alias'] = imp.get('alias')
-
-                    session.run("""
-                        MATCH (f:File {path: $file_path})
-                        MERGE (m:Module {name: $module_name})
-                        MERGE (f)-[r:IMPORTS]->(m)
-                        SET r += $props
-                    """, file_path=file_path_str, module_name=module_name, props=rel_props)
+                    js_import_rows.append({'file_path': file_path_str, 'module_name': module_name, 'props': rel_props})
                 else:
                     # Existing logic for Python (and other languages)
-                    set_clauses = ["m.alias = $alias"]
-                    if 'full_import_name' in imp:
-                        set_clauses.append("m.full_import_name = $full_import_name")
-                    set_clause_str = ", ".join(set_clauses)
-
-                    session.run(f"""
-                        MATCH (f:File {{path: $file_path}})
-                        MERGE (m:Module {{name: $name}})
-                        SET {set_clause_str}
-                        MERGE (f)-[:IMPORTS]->(m)
-                    """, file_path=file_path_str, **imp)
+                    import_rows.append({
+                        'file_path': file_path_str,
+                        'name': imp['name'],
+                        'alias': imp.get('alias'),
+                        'full_import_name': imp.get('full_import_name'),
+                    })
 
             # Handle CONTAINS relationship between class to their children like variables
-            for func in file_data.get('functions', []):
-                if func.get('class_context'):
-                    session.run("""
-                        MATCH (c:Class {name: $class_name, file_path: $file_path})
-                        MATCH (fn:Function {name: $func_name, file_path: $file_path, line_number: $func_line})
-                        MERGE (c)-[:CONTAINS]->(fn)
-                    """, 
-                    class_name=func['class_context'],
-                    file_path=file_path_str,
-                    func_name=func['name'],
-                    func_line=func['line_number'])
+            class_member_rows.extend(
+                {'file_path': file_path_str, 'class_name': func['class_context'], 'func_name': func['name'], 'func_line': func['line_number']}
+                for func in file_data.get('functions', [])
+                if func.get('class_context')
+            )
+
+        # All writes for the batch share one transaction: it commits when the block exits
+        # normally and rolls back if any statement raises. Queries run in dependency order,
+        # files and directories before the nodes and relationships that hang off them.
+        with self.driver.session() as session, session.begin_transaction() as tx:
+            _run_unwind(tx, MERGE_FILES_QUERY, file_rows)
+            # The first directory of a chain hangs off the repository, every later one off a
+            # directory. Parents are matched before a directory is merged, and a level's parents
+            # are all written by the statement before it.
+            for depth, rows in enumerate(directory_levels):
+                _run_unwind(tx, _merge_directories_query('Directory' if depth else 'Repository'), rows)
+            for parent_label, rows in file_link_rows.items():
+                _run_unwind(tx, _link_files_query(parent_label), rows)
+            for label, rows in node_rows.items():
+                _run_unwind(tx, _merge_contained_nodes_query(label), rows)
+            _run_unwind(tx, MERGE_PARAMETERS_QUERY, parameter_rows)
+            _run_unwind(tx, LINK_NESTED_FUNCTIONS_QUERY, nested_rows)
+            _run_unwind(tx, MERGE_JS_IMPORTS_QUERY, js_import_rows)
+            # full_import_name is only overwritten when the import provides one.
+            _run_unwind(tx, MERGE_IMPORTS_QUERY, import_rows)
+            _run_unwind(tx, LINK_CLASS_MEMBERS_QUERY, class_member_rows)
 
             # Class inheritance is handled in a separate pass after all files are processed.
             # Function calls are also handled in a separate pass after all files are processed.
 
+    def _resolve_imported_path(self, name: str, full_import_name: str, imports_map: dict) -> Optional[str]:
+        """
+        Picks the file defining `name` that belongs to the module it was imported from.
+        The same imports recur across many call sites, so each answer is indexed after the first scan.
+        """
+        key = (name, full_import_name)
+        try:
+            return self._import_path_index[key]
+        except KeyError:
+            pass
+        module_path = full_import_name.replace('.', '/')
+        resolved_path = next((path for path in imports_map.get(name, []) if module_path in path), None)
+        self._import_path_index[key] = resolved_path
+        return resolved_path
+
     # Second pass to create relationships that depend on all files being present like call functions and class inheritance
-    def _create_function_calls(self, session, file_data: Dict, imports_map: dict):
-        """Create CALLS relationships with a unified, prioritized logic flow for all call types."""
+    def _collect_function_calls(self, file_data: Dict, imports_map: dict, function_calls: list, file_calls: list):
+        """
+        Resolve CALLS relationships with a unified, prioritized logic flow for all call types.
+        Rows are appended to `function_calls` (caller is a function) or `file_calls` (top-level calls).
+        """
         caller_file_path = str(Path(file_data['file_path']).resolve())
         local_function_names = {func['name'] for func in file_data.get('functions', [])}
         local_imports = {imp.get('alias') or imp['name'].split('.')[-1]: imp['name'] 
@@ -361,7 +883,7 @@ class GraphBuilder:
         
         for call in file_data.get('function_calls', []):
             called_name = call['name']
-            if called_name in __builtins__: continue
+            if called_name in _BUILTINS: continue
 
             resolved_path = None
             
@@ -380,11 +902,7 @@ class GraphBuilder:
                 elif len(possible_paths) == 1:
                     resolved_path = possible_paths[0]
                 elif len(possible_paths) > 1 and lookup_name in local_imports:
-                    full_import_name = local_imports[lookup_name]
-                    for path in possible_paths:
-                        if full_import_name.replace('.', '/') in path:
-                            resolved_path = path
-                            break
+                    resolved_path = self._resolve_imported_path(lookup_name, local_imports[lookup_name], imports_map)
             
             if not resolved_path:
                 if called_name in imports_map and imports_map[called_name]:
@@ -392,43 +910,40 @@ class GraphBuilder:
                 else:
                     resolved_path = caller_file_path
 
+            row = {
+                'caller_file_path': caller_file_path,
+                'called_name': called_name,
+                'called_file_path': resolved_path,
+                'line_number': call['line_number'],
+                'args': call.get('args', []),
+                'full_call_name': call.get('full_name', called_name),
+            }
             caller_context = call.get('context')
             if caller_context and len(caller_context) == 3 and caller_context[0] is not None:
                 caller_name, _, caller_line_number = caller_context
-                session.run("""
-                    MATCH (caller:Function {name: $caller_name, file_path: $caller_file_path, line_number: $caller_line_number})
-                    MATCH (called:Function {name: $called_name, file_path: $called_file_path})
-                    MERGE (caller)-[:CALLS {line_number: $line_number, args: $args, full_call_name: $full_call_name}]->(called)
-                """,
-                caller_name=caller_name,
-                caller_file_path=caller_file_path,
-                caller_line_number=caller_line_number,
-                called_name=called_name,
-                called_file_path=resolved_path,
-                line_number=call['line_number'],
-                args=call.get('args', []),
-                full_call_name=call.get('full_name', called_name))
+                row['caller_name'] = caller_name
+                row['caller_line_number'] = caller_line_number
+                function_calls.append(row)
             else:
-                session.run("""
-                    MATCH (caller:File {path: $caller_file_path})
-                    MATCH (called:Function {name: $called_name, file_path: $called_file_path})
-                    MERGE (caller)-[:CALLS {line_number: $line_number, args: $args, full_call_name: $full_call_name}]->(called)
-                """,
-                caller_file_path=caller_file_path,
-                called_name=called_name,
-                called_file_path=resolved_path,
-                line_number=call['line_number'],
-                args=call.get('args', []),
-                full_call_name=call.get('full_name', called_name))
+                file_calls.append(row)
 
     def _create_all_function_calls(self, all_file_data: list[Dict], imports_map: dict):
         """Create CALLS relationships for all functions after all files have been processed."""
+        self._import_path_index = {}
+        function_calls, file_calls = [], []
+        for file_data in all_file_data:
+            if file_data.get('function_calls'):
+                self._collect_function_calls(file_data, imports_map, function_calls, file_calls)
+        if not (function_calls or file_calls):
+            return
+
+        # Edges for the whole run are written in UNWIND batches rather than one query per call.
         with self.driver.session() as session:
-            for file_data in all_file_data:
-                self._create_function_calls(session, file_data, imports_map)
+            _run_unwind(session, MERGE_FUNCTION_CALLS_QUERY, function_calls)
+            _run_unwind(session, MERGE_FILE_CALLS_QUERY, file_calls)
 
-    def _create_inheritance_links(self, session, file_data: Dict, imports_map: dict):
-        """Create INHERITS relationships with a more robust resolution logic."""
+    def _collect_inheritance_links(self, file_data: Dict, imports_map: dict, links: list):
+        """Resolve INHERITS relationships with a more robust resolution logic, appending rows to `links`."""
         caller_file_path = str(Path(file_data['file_path']).resolve())
         local_class_names = {c['name'] for c in file_data.get('classes', [])}
         # Create a map of local import aliases/names to full import names
@@ -452,13 +967,8 @@ class GraphBuilder:
                     
                     # Case 1: The prefix is a known import
                     if lookup_name in local_imports:
-                        full_import_name = local_imports[lookup_name]
-                        possible_paths = imports_map.get(target_class_name, [])
                         # Find the path that corresponds to the imported module
-                        for path in possible_paths:
-                            if full_import_name.replace('.', '/') in path:
-                                resolved_path = path
-                                break
+                        resolved_path = self._resolve_imported_path(target_class_name, local_imports[lookup_name], imports_map)
                 # Handle simple names
                 else:
                     lookup_name = base_class_str
@@ -467,70 +977,48 @@ class GraphBuilder:
                         resolved_path = caller_file_path
                     # Case 3: The base class was imported directly (e.g., from module import Parent)
                     elif lookup_name in local_imports:
-                        full_import_name = local_imports[lookup_name]
-                        possible_paths = imports_map.get(target_class_name, [])
-                        for path in possible_paths:
-                            if full_import_name.replace('.', '/') in path:
-                                resolved_path = path
-                                break
+                        resolved_path = self._resolve_imported_path(target_class_name, local_imports[lookup_name], imports_map)
                     # Case 4: Fallback to global map (less reliable)
                     elif lookup_name in imports_map:
                         possible_paths = imports_map[lookup_name]
                         if len(possible_paths) == 1:
                             resolved_path = possible_paths[0]
                 
-                # If a path was found, create the relationship
+                # If a path was found, record the relationship
                 if resolved_path:
-                    session.run("""
-                        MATCH (child:Class {name: $child_name, file_path: $file_path})
-                        MATCH (parent:Class {name: $parent_name, file_path: $resolved_parent_file_path})
-                        MERGE (child)-[:INHERITS]->(parent)
-                    """,
-                    child_name=class_item['name'],
-                    file_path=caller_file_path,
-                    parent_name=target_class_name,
-                    resolved_parent_file_path=resolved_path)
+                    links.append({
+                        'child_name': class_item['name'],
+                        'file_path': caller_file_path,
+                        'parent_name': target_class_name,
+                        'resolved_parent_file_path': resolved_path,
+                    })
 
     def _create_all_inheritance_links(self, all_file_data: list[Dict], imports_map: dict):
         """Create INHERITS relationships for all classes after all files have been processed."""
+        self._import_path_index = {}
+        links = []
+        # Most files define no subclasses; skip them before any per-file setup.
+        relevant = [fd for fd in all_file_data if any(c.get('bases') for c in fd.get('classes', []))]
+        for file_data in relevant:
+            self._collect_inheritance_links(file_data, imports_map, links)
+        if not links:
+            return
+
         with self.driver.session() as session:
-            for file_data in all_file_data:
-                self._create_inheritance_links(session, file_data, imports_map)
+            _run_unwind(session, MERGE_INHERITANCE_QUERY, links)
                 
     def delete_file_from_graph(self, file_path: str):
-        """Deletes a file and all its contained elements and relationships."""
+        """Deletes a file, all its contained elements and relationships, and the directories it leaves empty."""
         file_path_str = str(Path(file_path).resolve())
         with self.driver.session() as session:
-            parents_res = session.run("""
-                MATCH (f:File {path: $path})<-[:CONTAINS*]-(d:Directory)
-                RETURN d.path as path ORDER BY d.path DESC
-            """, path=file_path_str)
-            parent_paths = [record["path"] for record in parents_res]
-
-            session.run(
-                """
-                MATCH (f:File {path: $path})
-                OPTIONAL MATCH (f)-[:CONTAINS]->(element)
-                DETACH DELETE f, element
-                """,
-                path=file_path_str,
-            )
+            session.run(DELETE_FILE_QUERY, path=file_path_str)
             info_logger(f"Deleted file and its elements from graph: {file_path_str}")
 
-            for path in parent_paths:
-                session.run("""
-                    MATCH (d:Directory {path: $path})
-                    WHERE NOT (d)-[:CONTAINS]->()
-                    DETACH DELETE d
-                """, path=path)
-
     def delete_repository_from_graph(self, repo_path: str):
         """Deletes a repository and all its contents from the graph."""
         repo_path_str = str(Path(repo_path).resolve())
         with self.driver.session() as session:
-            session.run("""MATCH (r:Repository {path: $path})
-                          OPTIONAL MATCH (r)-[:CONTAINS*]->(e)
-                          DETACH DELETE r, e""", path=repo_path_str)
+            session.run(DELETE_REPOSITORY_QUERY, path=repo_path_str)
             info_logger(f"Deleted repository and its contents from graph: {repo_path_str}")
 
     def update_file_in_graph(self, file_path: Path, repo_path: Path, imports_map: dict):
@@ -541,7 +1029,7 @@ class GraphBuilder:
         self.delete_file_from_graph(file_path_str)
 
         if file_path.exists():
-            file_data = self.parse_file(repo_path, file_path)
+            file_data = self.parse_file(repo_path, file_path, keep_tree=True)
             
             if "error" not in file_data:
                 self.add_file_to_graph(file_data, repo_name, imports_map)
@@ -552,41 +1040,23 @@ class GraphBuilder:
         else:
             return {"deleted": True, "path": file_path_str}
 
-    def parse_file(self, repo_path: Path, file_path: Path, is_dependency: bool = False) -> Dict:
-        """Parses a file with the appropriate language parser and extracts code elements."""
-        parser = self.parsers.get(file_path.suffix)
-        if not parser:
-            warning_logger(f"No parser found for file extension {file_path.suffix}. Skipping {file_path}")
-            return {"file_path": str(file_path), "error": f"No parser for {file_path.suffix}"}
-
-        debug_log(f"[parse_file] Starting parsing for: {file_path} with {parser.language_name} parser")
-        try:
-            if parser.language_name == 'python':
-                is_notebook = file_path.suffix == '.ipynb'
-                file_data = parser.parse(file_path, is_dependency, is_notebook=is_notebook)
-            else:
-                file_data = parser.parse(file_path, is_dependency)
-            file_data['repo_path'] = str(repo_path)
-            debug_log(f"[parse_file] Successfully parsed: {file_path}")
-            return file_data
-            
-        except Exception as e:
-            error_logger(f"Error parsing {file_path} with {parser.language_name} parser: {e}")
-            debug_log(f"[parse_file] Error parsing {file_path}: {e}")
-            return {"file_path": str(file_path), "error": str(e)}
+    def parse_file(self, repo_path: Path, file_path: Path, is_dependency: bool = False, keep_tree: bool = False) -> Dict:
+        """
+        Parses a file with the appropriate language parser and extracts code elements.
+        `keep_tree` is for files that will be re-parsed after edits, such as watched ones.
+        """
+        return _parse_path(self.parsers, repo_path, file_path, is_dependency, keep_tree)
 
     def estimate_processing_time(self, path: Path) -> Optional[Tuple[int, float]]:
         """Estimate processing time and file count"""
         try:
-            supported_extensions = self.parsers.keys()
             if path.is_file():
-                if path.suffix in supported_extensions:
+                if path.suffix in SUPPORTED_SUFFIXES:
                     files = [path]
                 else:
                     return 0, 0.0 # Not a supported file type
             else:
-                all_files = path.rglob("*")
-                files = [f for f in all_files if f.is_file() and f.suffix in supported_extensions]
+                files = list(_iter_source_files(path))
             
             total_files = len(files)
             estimated_time = total_files * 0.05 # tree-sitter is faster
@@ -614,34 +1084,54 @@ class GraphBuilder:
             else:
                 spec = None
 
-            supported_extensions = self.parsers.keys()
-            all_files = path.rglob("*") if path.is_dir() else [path]
-            files = [f for f in all_files if f.is_file() and f.suffix in supported_extensions]
-            if spec:
-                files = [f for f in files if not spec.match_file(str(f.relative_to(path)))]
+            if path.is_dir():
+                files = list(_iter_source_files(path, spec))
+            else:
+                files = [path] if path.suffix in SUPPORTED_SUFFIXES and path.is_file() else []
             if job_id:
                 self.job_manager.update_job(job_id, total_files=len(files))
             
             debug_log("Starting pre-scan to build imports map...")
-            imports_map = self._pre_scan_for_imports(files)
+            imports_map = self._pre_scan_for_imports(files, skip_languages=PARSE_INDEXED_LANGUAGES)
             debug_log(f"Pre-scan complete. Found {len(imports_map)} definitions.")
 
             all_file_data = []
+            # Parsed files waiting to be written, flushed one batch per transaction.
+            pending_writes = []
 
             processed_count = 0
-            for file in files:
-                if file.is_file():
+            repo_root = path.resolve() if path.is_dir() else None
+            tasks = [
+                (repo_root or file.parent.resolve(), file, is_dependency)
+                for file in files if file.is_file()
+            ]
+            parsed_files = self._aiter_parsed_files(tasks)
+            try:
+                for _, file, _ in tasks:
                     if job_id:
+                        # Set before waiting on the parse, so progress shows the file in flight.
                         self.job_manager.update_job(job_id, current_file=str(file))
-                    repo_path = path.resolve() if path.is_dir() else file.parent.resolve()
-                    file_data = self.parse_file(repo_path, file, is_dependency)
+                    file_data = await parsed_files.__anext__()
                     if "error" not in file_data:
-                        self.add_file_to_graph(file_data, repo_name, imports_map)
+                        pending_writes.append(file_data)
+                        if len(pending_writes) >= FILE_WRITE_BATCH_SIZE:
+                            self.add_files_to_graph(pending_writes, repo_name, imports_map)
+                            pending_writes = []
                         all_file_data.append(file_data)
+                        lang = file_data.get('lang')
+                        if lang in PARSE_INDEXED_LANGUAGES:
+                            # Nothing reads the map until linking starts below, after every file is parsed.
+                            resolved_path = str(Path(file_data['file_path']).resolve())
+                            for name in _definition_names(lang, file_data):
+                                imports_map.setdefault(name, []).append(resolved_path)
                     processed_count += 1
                     if job_id:
                         self.job_manager.update_job(job_id, processed_files=processed_count)
-                    await asyncio.sleep(0.01)
+            finally:
+                await parsed_files.aclose()
+
+            if pending_writes:
+                self.add_files_to_graph(pending_writes, repo_name, imports_map)
 
             self._create_all_inheritance_links(all_file_data, imports_map)
             self._create_all_function_calls(all_file_data, imports_map)
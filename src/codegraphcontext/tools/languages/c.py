@@ -1,87 +1,44 @@
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 from codegraphcontext.utils.debug_log import debug_log, info_logger, error_logger, warning_logger
 
-C_QUERIES = {
-    "functions": """
-        (function_definition
-            declarator: (function_declarator
-                declarator: (identifier) @name
-            )
-        ) @function_node
-        
-        (function_definition
-            declarator: (function_declarator
-                declarator: (pointer_declarator
-                    declarator: (identifier) @name
-                )
-            )
-        ) @function_node
-    """,
-    "structs": """
-        (struct_specifier
-            name: (type_identifier) @name
-        ) @struct
-    """,
-    "unions": """
-        (union_specifier
-            name: (type_identifier) @name
-        ) @union
-    """,
-    "enums": """
-        (enum_specifier
-            name: (type_identifier) @name
-        ) @enum
-    """,
-    "typedefs": """
-        (type_definition
-            declarator: (type_identifier) @name
-        ) @typedef
-    """,
-    "imports": """
-        (preproc_include
-            path: [
-                (string_literal) @path
-                (system_lib_string) @path
-            ]
-        ) @import
-    """,
-    "calls": """
-        (call_expression
-            function: (identifier) @name
-        )
-    """,
-    "variables": """
-        (declaration
-            declarator: (init_declarator
-                declarator: (identifier) @name
-            )
-        )
-        
-        (declaration
-            declarator: (init_declarator
-                declarator: (pointer_declarator
-                    declarator: (identifier) @name
-                )
-            )
-        )
-        
-        (declaration
-            declarator: (identifier) @name
-        )
-        
-        (declaration
-            declarator: (pointer_declarator
-                declarator: (identifier) @name
-            )
-        )
-    """,
-    "macros": """
-        (preproc_def
-            name: (identifier) @name
-        ) @macro
-    """,
-}
+# Constructs that give the nodes inside them a context, when they have a name.
+CONTEXT_TYPES = frozenset({'function_definition', 'struct_specifier', 'union_specifier', 'enum_specifier'})
+
+# Context of a node outside every named construct.
+NO_CONTEXT = (None, None, None)
+
+# Branching constructs, each adding one path to a function's cyclomatic complexity.
+COMPLEXITY_NODES = frozenset({
+    "if_statement", "for_statement", "while_statement", "do_statement",
+    "switch_statement", "case_statement", "conditional_expression",
+    "logical_expression", "binary_expression", "goto_statement",
+})
+
+# Leaf-like nodes whose children can't contain branches, so the walk doesn't descend into them.
+COMPLEXITY_SKIP_NODES = frozenset({"string_literal", "char_literal", "comment"})
+
+# Type specifiers in a declaration that name the declared variables' type.
+VARIABLE_TYPE_NODES = frozenset({"primitive_type", "type_identifier", "sized_type_specifier"})
+
+def _prepare_source(source: bytes) -> bytes:
+    """
+    Prepares a source file's bytes for tree-sitter as UTF-8. Valid files are passed through as
+    read, without a decode and re-encode of the whole file; invalid byte sequences are dropped.
+    Line endings are normalized as a text-mode read would, so CRLF and CR files give the same
+    source text and line numbers as LF ones.
+    """
+    if b"\r" in source:
+        source = source.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    if not source.isascii():
+        try:
+            source.decode("utf-8")
+        except UnicodeDecodeError:
+            source = source.decode("utf-8", errors="ignore").encode("utf-8")
+    return source
+
 
 class CTreeSitterParser:
     """A C-specific parser using tree-sitter."""
@@ -92,85 +49,150 @@ class CTreeSitterParser:
         self.language = generic_parser_wrapper.language
         self.parser = generic_parser_wrapper.parser
 
-        self.queries = {
-            name: self.language.query(query_str)
-            for name, query_str in C_QUERIES.items()
+        # Node type -> collector that records the construct, if it is one we index.
+        self._collectors = {
+            "function_definition": self._collect_function,
+            "struct_specifier": self._collect_struct_union_enum,
+            "union_specifier": self._collect_struct_union_enum,
+            "enum_specifier": self._collect_struct_union_enum,
+            "preproc_include": self._collect_import,
+            "call_expression": self._collect_call,
+            "declaration": self._collect_variables,
+            "preproc_def": self._collect_macro,
+            "type_definition": self._collect_typedefs,
         }
+        # Parent node id -> (end rows, texts) of its comment children that can document the
+        # code below them, in document order; built once per parent and reset per walk.
+        self._comment_index: Dict[int, Tuple[list[int], list[str]]] = {}
 
     def _get_node_text(self, node: Any) -> str:
         return node.text.decode("utf-8")
 
-    def parse(self, file_path: Path, is_dependency: bool = False) -> Dict[str, Any]:
+    def parse(self, file_path: Path, is_dependency: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False) -> Dict[str, Any]:
         """Parses a C file and returns its structure."""
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            source_code = f.read()
-
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-        root_node = tree.root_node
+        source_bytes = _prepare_source(source if source is not None else file_path.read_bytes())
 
-        functions = self._find_functions(root_node)
-        classes = self._find_structs_unions_enums(root_node)
-        imports = self._find_imports(root_node)
-        function_calls = self._find_calls(root_node)
-        variables = self._find_variables(root_node)
-        macros = self._find_macros(root_node)
+        tree = self.generic_parser_wrapper.parse_tree(source_bytes, file_path, keep_tree)
+        found = self._walk(tree.root_node)
 
         return {
             "file_path": str(file_path),
-            "functions": functions,
-            "classes": classes,
-            "variables": variables,
-            "imports": imports,
-            "function_calls": function_calls,
-            "macros": macros,
+            "functions": found["function_definition"],
+            # Structs first, then unions, then enums.
+            "classes": found["struct_specifier"] + found["union_specifier"] + found["enum_specifier"],
+            "variables": found["declaration"],
+            "imports": found["preproc_include"],
+            "function_calls": found["call_expression"],
+            "macros": found["preproc_def"],
+            "typedefs": found["type_definition"],
             "is_dependency": is_dependency,
             "lang": self.language_name,
         }
 
-    def _get_parent_context(self, node: Any, types: tuple = ('function_definition', 'struct_specifier', 'union_specifier', 'enum_specifier')) -> tuple:
-        """Get parent context for nested constructs."""
-        curr = node.parent
-        while curr:
-            if curr.type in types:
-                name_node = curr.child_by_field_name('name')
+    def _walk(self, root_node: Any) -> Dict[str, list[Dict[str, Any]]]:
+        """
+        Visits every node once in document order, handing each indexed construct to its
+        collector along with its context: the (name, type, line) of the innermost named
+        construct enclosing it. Results are grouped by the node type that was collected.
+        """
+        found: Dict[str, list[Dict[str, Any]]] = {node_type: [] for node_type in self._collectors}
+        self._comment_index = {}
+        collectors = self._collectors
+        # (depth, context) for each named construct enclosing the current node, innermost last.
+        # Contexts are tracked on the way down, so nodes never climb their ancestors for them.
+        contexts: list[Tuple[int, tuple]] = []
+        depth = 0
+        cursor = root_node.walk()
+        while True:
+            node = cursor.node
+            node_type = node.type
+            while contexts and contexts[-1][0] >= depth:
+                contexts.pop()
+            collect = collectors.get(node_type)
+            if collect is not None:
+                collect(node, found[node_type], contexts[-1][1] if contexts else NO_CONTEXT)
+            if node_type in CONTEXT_TYPES:
+                name_node = node.child_by_field_name('name')
                 if name_node:
-                    return self._get_node_text(name_node), curr.type, curr.start_point[0] + 1
-            curr = curr.parent
-        return None, None, None
+                    contexts.append((depth, (self._get_node_text(name_node), node_type, node.start_point[0] + 1)))
+            if cursor.goto_first_child():
+                depth += 1
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return found
+                depth -= 1
 
     def _calculate_complexity(self, node: Any) -> int:
         """Calculate cyclomatic complexity for C functions."""
-        complexity_nodes = {
-            "if_statement", "for_statement", "while_statement", "do_statement",
-            "switch_statement", "case_statement", "conditional_expression",
-            "logical_expression", "binary_expression", "goto_statement"
-        }
         count = 1
-        
-        def traverse(n):
-            nonlocal count
-            if n.type in complexity_nodes:
+        cursor = node.walk()
+        while True:
+            node_type = cursor.node.type
+            if node_type in COMPLEXITY_NODES:
                 count += 1
-            for child in n.children:
-                traverse(child)
-        
-        traverse(node)
-        return count
+            if node_type not in COMPLEXITY_SKIP_NODES and cursor.goto_first_child():
+                continue
+            # The cursor is rooted at `node`, so climbing stops there.
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return count
 
     def _get_docstring(self, node: Any) -> Optional[str]:
         """Extract comments as documentation."""
-        # Look for comments before the node
-        if node.parent:
-            for child in node.parent.children:
-                if child.type == 'comment' and child.start_point[0] < node.start_point[0]:
-                    return self._get_node_text(child)
+        # The documentation is the comment ending on the line just above the node.
+        parent = node.parent
+        if parent:
+            index = self._comment_index.get(parent.id)
+            if index is None:
+                index = self._comment_index[parent.id] = self._index_comments(parent)
+            end_rows, texts = index
+            row = node.start_point[0]
+            i = bisect_left(end_rows, row) - 1
+            if i >= 0 and end_rows[i] == row - 1:
+                return texts[i]
         return None
 
-    def _parse_function_args(self, params_node: Any) -> list[Dict[str, Any]]:
-        """Enhanced helper to parse function arguments from a (parameter_list) node."""
+    def _index_comments(self, parent: Any) -> Tuple[list[int], list[str]]:
+        """
+        Collects the parent's comments that sit on lines of their own, sorted by end row.
+        Trailing comments (`int x; // ...`) describe the code before them, and comments
+        followed by code on the same line (`/* ... */ int x;`) the code after them,
+        so neither can document a construct that starts on a later line.
+        """
+        end_rows: list[int] = []
+        texts: list[str] = []
+        code_end_row = -1
+        pending = None
+        for child in parent.children:
+            if child.type == 'comment':
+                if pending is not None:
+                    end_rows.append(pending[0])
+                    texts.append(pending[1])
+                pending = None
+                if child.start_point[0] != code_end_row:
+                    pending = (child.end_point[0], self._get_node_text(child))
+            else:
+                if pending is not None and child.start_point[0] > pending[0]:
+                    end_rows.append(pending[0])
+                    texts.append(pending[1])
+                pending = None
+                code_end_row = child.end_point[0]
+        if pending is not None:
+            end_rows.append(pending[0])
+            texts.append(pending[1])
+        return end_rows, texts
+
+    def _parse_function_args(self, params_node: Any) -> Tuple[list[str], list[Dict[str, Any]]]:
+        """
+        Enhanced helper to parse function arguments from a (parameter_list) node.
+        Returns the names of the named arguments and the detailed info for every argument.
+        """
+        names = []
         args = []
         if not params_node:
-            return args
+            return names, args
             
         for param in params_node.named_children:
             if param.type == "parameter_declaration":
@@ -203,328 +225,285 @@ class CTreeSitterParser:
                     arg_info["type"] = "variadic"
                 
                 args.append(arg_info)
-        return args
-
-    def _find_functions(self, root_node: Any) -> list[Dict[str, Any]]:
-        functions = []
-        query = self.queries["functions"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == 'name':
-                func_node = node.parent.parent.parent
-                name = self._get_node_text(node)
-                
-                # Find parameters
-                params_node = None
-                body_node = None
-                for child in func_node.children:
-                    if child.type == "function_declarator":
-                        params_node = child.child_by_field_name("parameters")
-                    elif child.type == "compound_statement":
-                        body_node = child
-                
-                args = self._parse_function_args(params_node) if params_node else []
-                context, context_type, _ = self._get_parent_context(func_node)
+                if arg_info["name"]:
+                    names.append(arg_info["name"])
+        return names, args
 
-                functions.append({
-                    "name": name,
-                    "line_number": node.start_point[0] + 1,
-                    "end_line": func_node.end_point[0] + 1,
-                    "args": [arg["name"] for arg in args if arg["name"]],  # Simplified args for compatibility
-                    "source": self._get_node_text(func_node),
-                    "source_code": self._get_node_text(func_node),
-                    "docstring": self._get_docstring(func_node),
-                    "cyclomatic_complexity": self._calculate_complexity(func_node),
-                    "context": context,
-                    "context_type": context_type,
-                    "class_context": None,
-                    "decorators": [],
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                    "detailed_args": args,  # Keep detailed args for future use
-                })
-        return functions
-
-    def _find_structs_unions_enums(self, root_node: Any) -> list[Dict[str, Any]]:
-        """Find structs, unions, and enums (treated as classes in C)."""
-        classes = []
-        
-        # Find structs
-        query = self.queries["structs"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == 'name':
-                struct_node = node.parent
-                name = self._get_node_text(node)
-                context, context_type, _ = self._get_parent_context(struct_node)
-                
-                classes.append({
-                    "name": name,
-                    "line_number": node.start_point[0] + 1,
-                    "end_line": struct_node.end_point[0] + 1,
-                    "bases": [],  # C doesn't have inheritance
-                    "source": self._get_node_text(struct_node),
-                    "docstring": self._get_docstring(struct_node),
-                    "context": context,
-                    "decorators": [],
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                    "type": "struct",
-                })
+    def _collect_function(self, func_node: Any, functions: list[Dict[str, Any]], parent_context: tuple):
+        """Records a function definition declared as `name(...)` or `(*name)(...)`."""
+        declarator = func_node.child_by_field_name("declarator")
+        if declarator is None or declarator.type != "function_declarator":
+            return
+        node = declarator.child_by_field_name("declarator")
+        if node is not None and node.type == "pointer_declarator":
+            node = node.child_by_field_name("declarator")
+        if node is None or node.type != "identifier":
+            return
+        name = self._get_node_text(node)
 
-        # Find unions
-        query = self.queries["unions"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == 'name':
-                union_node = node.parent
-                name = self._get_node_text(node)
-                context, context_type, _ = self._get_parent_context(union_node)
-                
-                classes.append({
-                    "name": name,
-                    "line_number": node.start_point[0] + 1,
-                    "end_line": union_node.end_point[0] + 1,
-                    "bases": [],
-                    "source": self._get_node_text(union_node),
-                    "docstring": self._get_docstring(union_node),
-                    "context": context,
-                    "decorators": [],
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                    "type": "union",
-                })
+        # Find parameters
+        params_node = declarator.child_by_field_name("parameters")
+        arg_names, args = self._parse_function_args(params_node) if params_node else ([], [])
+        context, context_type, _ = parent_context
+        source = self._get_node_text(func_node)
 
-        # Find enums
-        query = self.queries["enums"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == 'name':
-                enum_node = node.parent
-                name = self._get_node_text(node)
-                context, context_type, _ = self._get_parent_context(enum_node)
-                
-                classes.append({
-                    "name": name,
-                    "line_number": node.start_point[0] + 1,
-                    "end_line": enum_node.end_point[0] + 1,
-                    "bases": [],
-                    "source": self._get_node_text(enum_node),
-                    "docstring": self._get_docstring(enum_node),
-                    "context": context,
-                    "decorators": [],
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                    "type": "enum",
-                })
+        functions.append({
+            "name": name,
+            "line_number": node.start_point[0] + 1,
+            "end_line": func_node.end_point[0] + 1,
+            "args": arg_names,  # Simplified args for compatibility
+            "source": source,
+            "source_code": source,
+            "docstring": self._get_docstring(func_node),
+            "cyclomatic_complexity": self._calculate_complexity(func_node),
+            "context": context,
+            "context_type": context_type,
+            "class_context": None,
+            "decorators": [],
+            "lang": self.language_name,
+            "is_dependency": False,
+            "detailed_args": args,  # Keep detailed args for future use
+        })
 
-        return classes
-
-    def _find_imports(self, root_node: Any) -> list[Dict[str, Any]]:
-        imports = []
-        query = self.queries["imports"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == 'path':
-                path = self._get_node_text(node).strip('"<>')
-                context, context_type, _ = self._get_parent_context(node)
-                
-                imports.append({
-                    "name": path,
-                    "full_import_name": path,
-                    "line_number": node.start_point[0] + 1,
-                    "alias": None,
-                    "context": context,
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                })
-        return imports
-
-    def _find_calls(self, root_node: Any) -> list[Dict[str, Any]]:
-        """Enhanced function call detection."""
-        calls = []
-        query = self.queries["calls"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == "name":
-                call_node = node.parent if node.parent.type == "call_expression" else node.parent.parent
-                call_name = self._get_node_text(node)
-                
-                # Extract arguments
-                args = []
-                args_node = call_node.child_by_field_name("arguments")
-                if args_node:
-                    for child in args_node.children:
-                        if child.type not in ['(', ')', ',']:
-                            args.append(self._get_node_text(child))
-                
-                context, context_type, _ = self._get_parent_context(call_node)
-                
-                calls.append({
-                    "name": call_name,
-                    "full_name": call_name,  # For C, function name is the same as full name
-                    "line_number": node.start_point[0] + 1,
-                    "args": args,
-                    "inferred_obj_type": None,
-                    "context": context,
-                    "class_context": None,
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                })
-        return calls
-
-    def _find_variables(self, root_node: Any) -> list[Dict[str, Any]]:
-        """Enhanced variable declaration detection."""
-        variables = []
-        query = self.queries["variables"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == "name":
-                var_name = self._get_node_text(node)
-                
-                # Find the declaration node
-                decl_node = node.parent
-                while decl_node and decl_node.type != "declaration":
-                    decl_node = decl_node.parent
-                
-                # Extract type information
-                var_type = None
-                is_pointer = False
-                is_array = False
-                value = None
-                
-                if decl_node:
-                    # Find type
-                    for child in decl_node.children:
-                        if child.type in ["primitive_type", "type_identifier", "sized_type_specifier"]:
-                            var_type = self._get_node_text(child)
-                        elif child.type == "init_declarator":
-                            # Check for pointer/array
-                            if child.child_by_field_name("declarator"):
-                                declarator = child.child_by_field_name("declarator")
-                                if declarator.type == "pointer_declarator":
-                                    is_pointer = True
-                                elif declarator.type == "array_declarator":
-                                    is_array = True
-                            
-                            # Check for initial value
-                            if child.child_by_field_name("value"):
-                                value = self._get_node_text(child.child_by_field_name("value"))
-                
-                context, context_type, _ = self._get_parent_context(node)
-                class_context, _, _ = self._get_parent_context(node, types=('struct_specifier', 'union_specifier', 'enum_specifier'))
-                
-                variables.append({
-                    "name": var_name,
-                    "line_number": node.start_point[0] + 1,
-                    "value": value,
-                    "type": var_type,
-                    "context": context,
-                    "class_context": class_context,
-                    "lang": self.language_name,
-                    "is_dependency": False,
-                    "is_pointer": is_pointer,
-                    "is_array": is_array,
-                })
-        return variables
-
-    def _find_macros(self, root_node: Any) -> list[Dict[str, Any]]:
-        """Enhanced preprocessor macro detection."""
-        macros = []
-        query = self.queries["macros"]
-        for match in query.captures(root_node):
-            capture_name = match[1]
-            node = match[0]
-            if capture_name == 'name':
-                macro_node = node.parent
-                name = self._get_node_text(node)
-                
-                # Extract macro value
-                value = None
-                if macro_node.child_by_field_name("value"):
-                    value = self._get_node_text(macro_node.child_by_field_name("value"))
-                
-                # Extract parameters for function-like macros
-                params = []
-                if macro_node.child_by_field_name("parameters"):
-                    params_node = macro_node.child_by_field_name("parameters")
-                    for child in params_node.children:
-                        if child.type == "identifier":
-                            params.append(self._get_node_text(child))
-                
-                context, context_type, _ = self._get_parent_context(macro_node)
-                
-                macros.append({
-                    "name": name,
+    def _collect_struct_union_enum(self, spec_node: Any, classes: list[Dict[str, Any]], parent_context: tuple):
+        """Records a named struct, union, or enum (treated as classes in C)."""
+        node = spec_node.child_by_field_name("name")
+        if node is None or node.type != "type_identifier":
+            return
+        name = self._get_node_text(node)
+        context, context_type, _ = parent_context
+
+        classes.append({
+            "name": name,
+            "line_number": node.start_point[0] + 1,
+            "end_line": spec_node.end_point[0] + 1,
+            "bases": [],  # C doesn't have inheritance
+            "source": self._get_node_text(spec_node),
+            "docstring": self._get_docstring(spec_node),
+            "context": context,
+            "decorators": [],
+            "lang": self.language_name,
+            "is_dependency": False,
+            "type": spec_node.type[:-len("_specifier")],
+        })
+
+    def _collect_import(self, include_node: Any, imports: list[Dict[str, Any]], parent_context: tuple):
+        node = include_node.child_by_field_name("path")
+        if node is None or node.type not in ("string_literal", "system_lib_string"):
+            return
+        path = self._get_node_text(node).strip('"<>')
+        context, context_type, _ = parent_context
+
+        imports.append({
+            "name": path,
+            "full_import_name": path,
+            "line_number": node.start_point[0] + 1,
+            "alias": None,
+            "context": context,
+            "lang": self.language_name,
+            "is_dependency": False,
+        })
+
+    def _collect_call(self, call_node: Any, calls: list[Dict[str, Any]], parent_context: tuple):
+        """Records a call to a function by name."""
+        node = call_node.child_by_field_name("function")
+        if node is None or node.type != "identifier":
+            return
+        call_name = self._get_node_text(node)
+
+        # Extract arguments; the parentheses and commas are anonymous nodes, so named_children skips them.
+        args_node = call_node.child_by_field_name("arguments")
+        args = [self._get_node_text(child) for child in args_node.named_children] if args_node else []
+
+        context, context_type, _ = parent_context
+
+        calls.append({
+            "name": call_name,
+            "full_name": call_name,  # For C, function name is the same as full name
+            "line_number": node.start_point[0] + 1,
+            "args": args,
+            "inferred_obj_type": None,
+            "context": context,
+            "class_context": None,
+            "lang": self.language_name,
+            "is_dependency": False,
+        })
+
+    def _collect_variables(self, decl_node: Any, variables: list[Dict[str, Any]], parent_context: tuple):
+        """Records each variable declared as `x`, `*x`, `x = ...`, or `*x = ...` in a declaration."""
+        name_nodes = []
+        for declarator in decl_node.children_by_field_name("declarator"):
+            node = declarator
+            if node.type == "init_declarator":
+                node = node.child_by_field_name("declarator")
+            if node is not None and node.type == "pointer_declarator":
+                node = node.child_by_field_name("declarator")
+            if node is not None and node.type == "identifier":
+                name_nodes.append(node)
+        if not name_nodes:
+            # e.g. function prototypes; there is nothing to record, so the type scan is skipped.
+            return
+
+        # Extract type information. It is read from the declaration as a whole, so it is
+        # gathered once and shared by every variable the declaration names.
+        var_type = None
+        is_pointer = False
+        is_array = False
+        value = None
+
+        # Find type
+        for child in decl_node.children:
+            if child.type in VARIABLE_TYPE_NODES:
+                var_type = self._get_node_text(child)
+            elif child.type == "init_declarator":
+                # Check for pointer/array
+                inner_declarator = child.child_by_field_name("declarator")
+                if inner_declarator:
+                    if inner_declarator.type == "pointer_declarator":
+                        is_pointer = True
+                    elif inner_declarator.type == "array_declarator":
+                        is_array = True
+
+                # Check for initial value
+                value_node = child.child_by_field_name("value")
+                if value_node:
+                    value = self._get_node_text(value_node)
+
+        context, context_type, _ = parent_context
+        # Function definitions have no name field in the C grammar, so any named context is a struct, union, or enum.
+        class_context = context
+
+        for node in name_nodes:
+            variables.append({
+                "name": self._get_node_text(node),
+                "line_number": node.start_point[0] + 1,
+                "value": value,
+                "type": var_type,
+                "context": context,
+                "class_context": class_context,
+                "lang": self.language_name,
+                "is_dependency": False,
+                "is_pointer": is_pointer,
+                "is_array": is_array,
+            })
+
+    def _collect_macro(self, macro_node: Any, macros: list[Dict[str, Any]], parent_context: tuple):
+        """Records a preprocessor macro definition."""
+        node = macro_node.child_by_field_name("name")
+        if node is None or node.type != "identifier":
+            return
+        name = self._get_node_text(node)
+
+        # Extract macro value
+        value = None
+        if macro_node.child_by_field_name("value"):
+            value = self._get_node_text(macro_node.child_by_field_name("value"))
+
+        # Extract parameters for function-like macros
+        params_node = macro_node.child_by_field_name("parameters")
+        params = [
+            self._get_node_text(child) for child in params_node.named_children if child.type == "identifier"
+        ] if params_node else []
+
+        context, context_type, _ = parent_context
+
+        macros.append({
+            "name": name,
+            "line_number": node.start_point[0] + 1,
+            "end_line": macro_node.end_point[0] + 1,
+            "source": self._get_node_text(macro_node),
+            "value": value,
+            "params": params,
+            "context": context,
+            "lang": self.language_name,
+            "is_dependency": False,
+        })
+
+    def _collect_typedefs(self, typedef_node: Any, typedefs: list[Dict[str, Any]], parent_context: tuple):
+        """Records each name a typedef introduces."""
+        for node in typedef_node.children_by_field_name("declarator"):
+            if node.type == "type_identifier":
+                typedefs.append({
+                    "name": self._get_node_text(node),
                     "line_number": node.start_point[0] + 1,
-                    "end_line": macro_node.end_point[0] + 1,
-                    "source": self._get_node_text(macro_node),
-                    "value": value,
-                    "params": params,
-                    "context": context,
-                    "lang": self.language_name,
-                    "is_dependency": False,
                 })
-        return macros
 
 
-def pre_scan_c(files: list[Path], parser_wrapper) -> dict:
-    """Scans C files to create a map of function/struct/union/enum names to their file paths."""
-    imports_map = {}
-    query_str = """
-        (function_definition
-            declarator: (function_declarator
-                declarator: (identifier) @name
-            )
+def definition_names_c(file_data: Dict[str, Any]) -> list[str]:
+    """
+    Returns the names `pre_scan_c` would map to a file, read from the file's parse result,
+    so files parsed in the main pass don't need a pre-scan.
+    """
+    return [
+        item["name"]
+        for key in ("functions", "classes", "typedefs", "macros")
+        for item in file_data.get(key, [])
+    ]
+
+
+PRE_SCAN_QUERY = """
+    (function_definition
+        declarator: (function_declarator
+            declarator: (identifier) @name
         )
-        
-        (function_definition
-            declarator: (function_declarator
-                declarator: (pointer_declarator
-                    declarator: (identifier) @name
-                )
+    )
+    
+    (function_definition
+        declarator: (function_declarator
+            declarator: (pointer_declarator
+                declarator: (identifier) @name
             )
         )
-        
-        (struct_specifier
-            name: (type_identifier) @name
-        )
-        
-        (union_specifier
-            name: (type_identifier) @name
-        )
-        
-        (enum_specifier
-            name: (type_identifier) @name
-        )
-        
-        (type_definition
-            declarator: (type_identifier) @name
-        )
-        
-        (preproc_def
-            name: (identifier) @name
-        )
+    )
+    
+    (struct_specifier
+        name: (type_identifier) @name
+    )
+    
+    (union_specifier
+        name: (type_identifier) @name
+    )
+    
+    (enum_specifier
+        name: (type_identifier) @name
+    )
+    
+    (type_definition
+        declarator: (type_identifier) @name
+    )
+    
+    (preproc_def
+        name: (identifier) @name
+    )
+"""
+
+
+@lru_cache(maxsize=None)
+def _pre_scan_query(language: Any) -> Any:
+    """Compiles the pre-scan query once per process rather than once per scan."""
+    return language.query(PRE_SCAN_QUERY)
+
+
+def pre_scan_c(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
+    """
+    Scans C files to create a map of function/struct/union/enum names to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
     """
-    query = parser_wrapper.language.query(query_str)
+    imports_map = {}
+    query = _pre_scan_query(parser_wrapper.language)
     
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                tree = parser_wrapper.parser.parse(bytes(f.read(), "utf8"))
+            # Reuses the file's tree only if one was kept for the watcher; a full build parses afresh.
+            tree = parser_wrapper.parse_tree(_prepare_source(source if source is not None else file_path.read_bytes()), file_path)
+            # Resolved once per file; resolve() stats each path component.
+            resolved_path = str(file_path.resolve())
             
             for capture, _ in query.captures(tree.root_node):
                 name = capture.text.decode('utf-8')
                 if name not in imports_map:
                     imports_map[name] = []
-                imports_map[name].append(str(file_path.resolve()))
+                imports_map[name].append(resolved_path)
         except Exception as e:
             warning_logger(f"Tree-sitter pre-scan failed for {file_path}: {e}")
     return imports_map
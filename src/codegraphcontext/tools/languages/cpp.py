@@ -108,12 +108,12 @@ class CppTreeSitterParser:
     def _get_node_text(self, node) -> str:
         return node.text.decode('utf-8')
 
-    def parse(self, file_path: Path, is_dependency: bool = False, **kwargs) -> Dict:
+    def parse(self, file_path: Path, is_dependency: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False, **kwargs) -> Dict:
         """Parses a C++ file and returns its structure."""
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            source_code = f.read()
+        source_code = self.generic_parser_wrapper.read_text(file_path, source, errors="ignore")
 
-        tree = self.parser.parse(bytes(source_code, "utf8"))
+        tree = self.generic_parser_wrapper.parse_tree(bytes(source_code, "utf8"), file_path, keep_tree)
         root_node = tree.root_node
 
         functions = self._find_functions(root_node)
@@ -426,10 +426,11 @@ class CppTreeSitterParser:
         return "::".join(name_parts) if name_parts else None
 
 
-def pre_scan_cpp(files: list[Path], parser_wrapper) -> dict:
+def pre_scan_cpp(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
     """
     Quickly scans C++ files to build a map of top-level class, struct, and function names
     to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
     """
     imports_map = {}
 
@@ -440,11 +441,10 @@ def pre_scan_cpp(files: list[Path], parser_wrapper) -> dict:
     """
     query = parser_wrapper.language.query(query_str)
 
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                source_bytes = f.read().encode("utf-8")
-                tree = parser_wrapper.parser.parse(source_bytes)
+            source_bytes = parser_wrapper.read_text(file_path, source, errors="ignore").encode("utf-8")
+            tree = parser_wrapper.parser.parse(source_bytes)
 
             for node, capture_name in query.captures(tree.root_node):
                 if capture_name == "name":
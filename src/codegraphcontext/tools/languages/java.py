@@ -49,10 +49,10 @@ class JavaTreeSitterParser:
             for name, query_str in JAVA_QUERIES.items()
         }
 
-    def parse(self, file_path: Path, is_dependency: bool = False) -> Dict[str, Any]:
+    def parse(self, file_path: Path, is_dependency: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False) -> Dict[str, Any]:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                source_code = f.read()
+            source_code = self.generic_parser_wrapper.read_text(file_path, source, errors="ignore")
 
             if not source_code.strip():
                 warning_logger(f"Empty or whitespace-only file: {file_path}")
@@ -67,7 +67,7 @@ class JavaTreeSitterParser:
                     "lang": self.language_name,
                 }
 
-            tree = self.parser.parse(bytes(source_code, "utf8"))
+            tree = self.generic_parser_wrapper.parse_tree(bytes(source_code, "utf8"), file_path, keep_tree)
 
             parsed_functions = []
             parsed_classes = []
@@ -284,13 +284,16 @@ class JavaTreeSitterParser:
         return params
 
 
-def pre_scan_java(files: list[Path], parser_wrapper) -> dict:
+def pre_scan_java(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
+    """
+    Scans Java files to create a map of class/interface names to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
+    """
     name_to_files = {}
     
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            content = parser_wrapper.read_text(file_path, source, errors="ignore")
             
             class_matches = re.finditer(r'\b(?:public\s+|private\s+|protected\s+)?(?:static\s+)?(?:abstract\s+)?(?:final\s+)?class\s+(\w+)', content)
             for match in class_matches:
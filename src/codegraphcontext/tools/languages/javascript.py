@@ -159,12 +159,12 @@ class JavascriptTreeSitterParser:
         # This is a placeholder and needs more sophisticated logic
         return None
 
-    def parse(self, file_path: Path, is_dependency: bool = False) -> Dict:
+    def parse(self, file_path: Path, is_dependency: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False) -> Dict:
         """Parses a file and returns its structure in a standardized dictionary format."""
-        with open(file_path, "r", encoding="utf-8") as f:
-            source_code = f.read()
+        source_code = self.generic_parser_wrapper.read_text(file_path, source)
 
-        tree = self.parser.parse(bytes(source_code, "utf8"))
+        tree = self.generic_parser_wrapper.parse_tree(bytes(source_code, "utf8"), file_path, keep_tree)
         root_node = tree.root_node
 
         functions = self._find_functions(root_node)
@@ -532,8 +532,11 @@ class JavascriptTreeSitterParser:
         return variables
 
 
-def pre_scan_javascript(files: list[Path], parser_wrapper) -> dict:
-    """Scans JavaScript files to create a map of class/function names to their file paths."""
+def pre_scan_javascript(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
+    """
+    Scans JavaScript files to create a map of class/function names to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
+    """
     imports_map = {}
     query_str = """
         (class_declaration name: (identifier) @name)
@@ -556,10 +559,9 @@ def pre_scan_javascript(files: list[Path], parser_wrapper) -> dict:
     """
     query = parser_wrapper.language.query(query_str)
 
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                tree = parser_wrapper.parser.parse(bytes(f.read(), "utf8"))
+            tree = parser_wrapper.parser.parse(bytes(parser_wrapper.read_text(file_path, source), "utf8"))
 
             for capture, _ in query.captures(tree.root_node):
                 name = capture.text.decode('utf-8')
@@ -100,7 +100,8 @@ class PythonTreeSitterParser:
                     return self._get_node_text(first_child.children[0])
         return None
 
-    def parse(self, file_path: Path, is_dependency: bool = False, is_notebook: bool = False) -> Dict:
+    def parse(self, file_path: Path, is_dependency: bool = False, is_notebook: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False) -> Dict:
         """Parses a file and returns its structure in a standardized dictionary format."""
         original_file_path = file_path
         temp_py_file = None
@@ -109,8 +110,7 @@ class PythonTreeSitterParser:
         try:
             if is_notebook:
                 info_logger(f"Converting notebook {file_path} to temporary Python file.")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    notebook_node = nbformat.read(f, as_version=4)
+                notebook_node = nbformat.reads(self.generic_parser_wrapper.read_text(file_path, source), as_version=4)
                 
                 exporter = PythonExporter()
                 python_code, _ = exporter.from_notebook_node(notebook_node)
@@ -121,11 +121,11 @@ class PythonTreeSitterParser:
                 
                 # The file to be parsed is now the temporary file
                 file_path = temp_py_file
+                source = None
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                source_code = f.read()
+            source_code = self.generic_parser_wrapper.read_text(file_path, source)
             
-            tree = self.parser.parse(bytes(source_code, "utf8"))
+            tree = self.generic_parser_wrapper.parse_tree(bytes(source_code, "utf8"), original_file_path, keep_tree)
             root_node = tree.root_node
 
             functions = self._find_functions(root_node)
@@ -412,8 +412,11 @@ class PythonTreeSitterParser:
                 variables.append(variable_data)
         return variables
 
-def pre_scan_python(files: list[Path], parser_wrapper) -> dict:
-    """Scans Python files to create a map of class/function names to their file paths."""
+def pre_scan_python(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
+    """
+    Scans Python files to create a map of class/function names to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
+    """
     imports_map = {}
     query_str = """
         (class_definition name: (identifier) @name)
@@ -421,13 +424,12 @@ def pre_scan_python(files: list[Path], parser_wrapper) -> dict:
     """
     query = parser_wrapper.language.query(query_str)
     
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         temp_py_file = None
         try:
             source_to_parse = ""
             if file_path.suffix == '.ipynb':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    notebook_node = nbformat.read(f, as_version=4)
+                notebook_node = nbformat.reads(parser_wrapper.read_text(file_path, source), as_version=4)
                 exporter = PythonExporter()
                 python_code, _ = exporter.from_notebook_node(notebook_node)
                 with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.py', encoding='utf-8') as tf:
@@ -436,8 +438,7 @@ def pre_scan_python(files: list[Path], parser_wrapper) -> dict:
                 with open(temp_py_file, "r", encoding="utf-8") as f:
                     source_to_parse = f.read()
             else:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    source_to_parse = f.read()
+                source_to_parse = parser_wrapper.read_text(file_path, source)
 
             tree = parser_wrapper.parser.parse(bytes(source_to_parse, "utf8"))
             
@@ -51,12 +51,12 @@ class RustTreeSitterParser:
     def _get_node_text(self, node: Any) -> str:
         return node.text.decode("utf-8")
 
-    def parse(self, file_path: Path, is_dependency: bool = False) -> Dict[str, Any]:
+    def parse(self, file_path: Path, is_dependency: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False) -> Dict[str, Any]:
         """Parses a Rust file and returns its structure."""
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            source_code = f.read()
+        source_code = self.generic_parser_wrapper.read_text(file_path, source, errors="ignore")
 
-        tree = self.parser.parse(bytes(source_code, "utf8"))
+        tree = self.generic_parser_wrapper.parse_tree(bytes(source_code, "utf8"), file_path, keep_tree)
         root_node = tree.root_node
 
         functions = self._find_functions(root_node)
@@ -206,8 +206,11 @@ class RustTreeSitterParser:
                 )
         return calls
 
-def pre_scan_rust(files: list[Path], parser_wrapper) -> dict:
-    """Scans Rust files to create a map of function/struct/enum/trait names to their file paths."""
+def pre_scan_rust(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
+    """
+    Scans Rust files to create a map of function/struct/enum/trait names to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
+    """
     imports_map = {}
     query_str = """
         (function_item name: (identifier) @name)
@@ -217,10 +220,9 @@ def pre_scan_rust(files: list[Path], parser_wrapper) -> dict:
     """
     query = parser_wrapper.language.query(query_str)
 
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                tree = parser_wrapper.parser.parse(bytes(f.read(), "utf8"))
+            tree = parser_wrapper.parser.parse(bytes(parser_wrapper.read_text(file_path, source, errors="ignore"), "utf8"))
 
             for capture, _ in query.captures(tree.root_node):
                 name = capture.text.decode('utf-8')
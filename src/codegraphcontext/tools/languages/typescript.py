@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from codegraphcontext.utils.debug_log import debug_log, info_logger, error_logger, warning_logger, debug_logger
 
 TS_QUERIES = {
@@ -133,10 +133,10 @@ class TypescriptTreeSitterParser:
     def _get_docstring(self, body_node):
         return None
 
-    def parse(self, file_path: Path, is_dependency: bool = False) -> Dict:
-        with open(file_path, "r", encoding="utf-8") as f:
-            source_code = f.read()
-        tree = self.parser.parse(bytes(source_code, "utf8"))
+    def parse(self, file_path: Path, is_dependency: bool = False,
+              source: Optional[bytes] = None, keep_tree: bool = False) -> Dict:
+        source_code = self.generic_parser_wrapper.read_text(file_path, source)
+        tree = self.generic_parser_wrapper.parse_tree(bytes(source_code, "utf8"), file_path, keep_tree)
         root_node = tree.root_node
 
         functions = self._find_functions(root_node)
@@ -423,8 +423,11 @@ class TypescriptTreeSitterParser:
                 variables.append(variable_data)
         return variables
 
-def pre_scan_typescript(files: list[Path], parser_wrapper) -> dict:
-    """Scans TypeScript files to create a map of class/function names to their file paths."""
+def pre_scan_typescript(files: list[Path], parser_wrapper, sources: Optional[list[Optional[bytes]]] = None) -> dict:
+    """
+    Scans TypeScript files to create a map of class/function names to their file paths.
+    `sources` holds the files' bytes, in order, where the caller has already read them.
+    """
     imports_map = {}
     
     # Simplified queries that capture the parent nodes, then extract names manually
@@ -437,11 +440,10 @@ def pre_scan_typescript(files: list[Path], parser_wrapper) -> dict:
         "(type_alias_declaration) @type_alias",
     ]
     
-    for file_path in files:
+    for file_path, source in zip(files, sources or [None] * len(files)):
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source_code = f.read()
-                tree = parser_wrapper.parser.parse(bytes(source_code, "utf8"))
+            source_code = parser_wrapper.read_text(file_path, source)
+            tree = parser_wrapper.parser.parse(bytes(source_code, "utf8"))
             
             # Run each query separately
             for query_str in query_strings:
@@ -0,0 +1,12 @@
+# src/codegraphcontext/utils/cypher_safety.py
+"""
+Patterns for the read-only Cypher safety check shared by the MCP server and the CLI,
+compiled once per process. Keeping them in one place stops the two guards drifting apart.
+"""
+import re
+
+# Matches single or double quoted strings, handling escaped quotes.
+STRING_LITERAL_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+
+# All write keywords as one alternation, so the query is scanned once regardless of keyword count.
+FORBIDDEN_CYPHER_RE = re.compile(r'\b(?:CREATE|MERGE|DELETE|SET|REMOVE|DROP|CALL\s+apoc)\b', re.IGNORECASE)
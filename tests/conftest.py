@@ -4,6 +4,9 @@ import os
 import time
 import pytest
 
+# Keep test runs (and the cgc server they start) from writing to the user's parse cache.
+os.environ["CGC_PARSE_CACHE"] = "0"
+
 # Path to the sample project used in tests
 SAMPLE_PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "sample_project"))
 # SAMPLE_PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "sample_project_javascript"))
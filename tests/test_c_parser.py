@@ -0,0 +1,233 @@
+"""
+Tests for the C tree-sitter parser.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports (needed for direct test execution)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from codegraphcontext.tools.graph_builder import TreeSitterParser
+
+C_SAMPLE_PROJECT_PATH = Path(__file__).parent / "sample_project_c"
+
+
+@pytest.fixture(scope="module")
+def c_parser():
+    return TreeSitterParser("c")
+
+
+def _parse_source(c_parser, tmp_path, source):
+    source_file = tmp_path / "sample.c"
+    source_file.write_bytes(source)
+    return c_parser.parse(source_file)
+
+
+class TestDocstrings:
+    """Tests for the comments attached to C functions and structs as documentation"""
+
+    SOURCE = b"""// file header
+
+/* Adds numbers. */
+int add(int a, int b) { return a + b; }
+int x; // trailing comment about x
+int after_trailing(void) { return 0; }
+
+// separated by a blank line
+
+int far(void) { return 1; }
+/* leading */ int same_line(void) { return 2; }
+/**
+ * Block doc.
+ */
+struct point { int x; };
+// first line
+// second line
+static int multi(void) { return 3; }
+"""
+
+    def test_comment_directly_above_is_the_docstring(self, c_parser, tmp_path):
+        """Test each construct gets the nearest comment ending on the line above it, if any"""
+        result = _parse_source(c_parser, tmp_path, self.SOURCE)
+        docstrings = {item["name"]: item["docstring"] for item in result["functions"] + result["classes"]}
+
+        assert docstrings == {
+            "add": "/* Adds numbers. */",
+            "after_trailing": None,
+            "far": None,
+            "same_line": None,
+            "point": "/**\n * Block doc.\n */",
+            "multi": "// second line",
+        }
+
+    def test_trailing_comments_are_not_docstrings(self, c_parser):
+        """Test the sample project's trailing comments aren't taken as the next function's docs"""
+        for source_file in sorted(C_SAMPLE_PROJECT_PATH.rglob("*.[ch]")):
+            for function in c_parser.parse(source_file)["functions"]:
+                assert function["docstring"] is None, (source_file, function["name"])
+
+
+class TestLineEndings:
+    """Tests for parsing C files with Windows or classic Mac line endings"""
+
+    SOURCE = b"#include <stdio.h>\n\n// doc\nint f(int a)\n{\n  return a;\n}\n"
+
+    @pytest.mark.parametrize("newline", [b"\r\n", b"\r"], ids=["crlf", "cr"])
+    def test_line_endings_are_normalized(self, c_parser, tmp_path, newline):
+        """Test a file gives the same result whatever its line endings"""
+        expected = _parse_source(c_parser, tmp_path, self.SOURCE)
+        result = _parse_source(c_parser, tmp_path, self.SOURCE.replace(b"\n", newline))
+
+        assert result == expected
+        assert result["functions"][0]["source"] == "int f(int a)\n{\n  return a;\n}"
+        assert result["functions"][0]["line_number"] == 4
+
+
+# Per file: functions as (name, line, end line, args, complexity), variables as (name, line, type,
+# value), calls as (name, line, args), macros as (name, line, value), typedefs as (name, line),
+# and includes. No construct in the sample is nested in a named struct, union or enum.
+SAMPLE_PROJECT_EXPECTED = {
+    "include/config.h": {
+        "macros": [("CONFIG_H", 2, None), ("APP_NAME", 4, '"CgcSample"'), ("APP_VERSION", 5, '"0.1.0"'),
+                   ("ENABLE_STATS", 7, "1")],
+    },
+    "include/math/vec.h": {
+        "macros": [("VEC_H", 2, None)],
+        "typedefs": [("Vec3", 3)],
+    },
+    "include/module.h": {
+        "macros": [("MODULE_H", 2, None)],
+        "typedefs": [("Mode", 3)],
+    },
+    "include/platform.h": {
+        "macros": [("PLATFORM_H", 2, None), ("CGC_PLATFORM_WINDOWS", 5, "1"), ("CGC_PLATFORM_POSIX", 7, "1")],
+    },
+    "include/util.h": {
+        "functions": [("clamp", 11, 11, ["v", "lo", "hi"], 5)],
+        "variables": [("g_counter", 6, "int", None)],
+        "macros": [("UTIL_H", 2, None)],
+        "typedefs": [("Point", 7)],
+        "imports": ["stddef.h"],
+    },
+    "src/main.c": {
+        "functions": [("cmp_desc", 8, 8, ["a", "b"], 2), ("main", 10, 29, [], 3)],
+        "variables": [("p", 13, "Point", "{ .x = 3, .y = 4 }"), ("v", 14, "Vec3", "{4,5,6}"),
+                      ("w", 14, "Vec3", "{4,5,6}"), ("sum", 15, "Vec3", "vec_add(v, w)"),
+                      ("m", 17, "int", "max_int(p.x, p.y)"), ("r", 18, "int", "module_compute(m)"),
+                      ("f", 27, "cmp_fn", "cmp_desc")],
+        "function_calls": [
+            ("module_init", 11, ["MODE_A"]), ("vec_add", 15, ["v", "w"]), ("max_int", 17, ["p.x", "p.y"]),
+            ("module_compute", 18, ["m"]),
+            ("printf", 21, ['"%s %s (win) r=%d sum=(%.0f,%.0f,%.0f)\\n"', "APP_NAME", "APP_VERSION", "r",
+                            "sum.x", "sum.y", "sum.z"]),
+            ("printf", 23, ['"%s %s (posix) r=%d sum=(%.0f,%.0f,%.0f)\\n"', "APP_NAME", "APP_VERSION", "r",
+                            "sum.x", "sum.y", "sum.z"]),
+            ("f", 28, ["r", "g_counter"]),
+        ],
+        "imports": ["stdio.h", "config.h", "platform.h", "util.h", "math/vec.h", "module.h"],
+    },
+    "src/math/vec.c": {
+        "functions": [("vec_add", 2, 2, ["a", "b"], 4)],
+        "imports": ["math/vec.h"],
+    },
+    "src/module.c": {
+        "functions": [("module_init", 6, 9, ["m"], 1), ("module_compute", 11, 16, ["base"], 2)],
+        "variables": [("s_secret", 4, "int", "42")],
+        "function_calls": [("clamp", 15, ["base + s_secret", "0", "1000"])],
+        "imports": ["module.h", "util.h"],
+    },
+    "src/util.c": {
+        "functions": [("max_int", 5, 5, ["a", "b"], 3)],
+        "variables": [("g_counter", 3, "int", "0")],
+        "imports": ["util.h"],
+    },
+}
+
+
+def _summarize(result):
+    """Reduces a parse result to the fields pinned by these tests."""
+    return {
+        "functions": [(f["name"], f["line_number"], f["end_line"], f["args"], f["cyclomatic_complexity"])
+                      for f in result["functions"]],
+        "classes": [(c["name"], c["line_number"], c["end_line"], c["type"]) for c in result["classes"]],
+        "variables": [(v["name"], v["line_number"], v["type"], v["value"]) for v in result["variables"]],
+        "function_calls": [(c["name"], c["line_number"], c["args"]) for c in result["function_calls"]],
+        "macros": [(m["name"], m["line_number"], m["value"]) for m in result["macros"]],
+        "typedefs": [(t["name"], t["line_number"]) for t in result["typedefs"]],
+        "imports": [i["name"] for i in result["imports"]],
+    }
+
+
+class TestSampleProject:
+    """Tests pinning what the C parser extracts from tests/sample_project_c"""
+
+    @pytest.mark.parametrize("relative_path", sorted(SAMPLE_PROJECT_EXPECTED))
+    def test_sample_file(self, c_parser, relative_path):
+        """Test each construct is found with its position, arguments and complexity"""
+        result = c_parser.parse(C_SAMPLE_PROJECT_PATH / relative_path)
+        expected = {key: [] for key in _summarize(result)}
+        expected.update(SAMPLE_PROJECT_EXPECTED[relative_path])
+
+        assert _summarize(result) == expected
+        items = result["functions"] + result["variables"] + result["function_calls"] + result["macros"]
+        assert all(item["context"] is None for item in items)
+
+    def test_every_sample_file_is_covered(self):
+        """Test the expectations list every C file in the sample project"""
+        files = {f.relative_to(C_SAMPLE_PROJECT_PATH).as_posix() for f in C_SAMPLE_PROJECT_PATH.rglob("*.[ch]")}
+        assert files == set(SAMPLE_PROJECT_EXPECTED)
+
+    def test_function_source_is_the_definition(self, c_parser):
+        """Test a function's source is its own definition, not the whole file"""
+        main = c_parser.parse(C_SAMPLE_PROJECT_PATH / "src/main.c")["functions"][1]
+        assert main["source"].startswith("int main(void) {")
+        assert main["source"].endswith("return f(r, g_counter) < 0 ? 0 : 1;\n}")
+        assert main["source_code"] == main["source"]
+
+
+class TestNestedConstructs:
+    """Tests for contexts, classes and arguments outside the sample project"""
+
+    SOURCE = b"""struct outer {
+    struct inner { int y; } in;
+    union value { int i; float f; } v;
+    int count;
+};
+enum color { RED, GREEN };
+typedef struct outer outer_t, *outer_p;
+int apply(int (*fn)(int), int *values, int n) {
+    int total = 0;
+    for (int i = 0; i < n && values; i++) {
+        total += fn(values[i]);
+    }
+    return total > 0 ? total : -total;
+}
+"""
+
+    def test_nested_constructs(self, c_parser, tmp_path):
+        """Test classes record their enclosing struct, and functions their arguments and branches"""
+        result = _parse_source(c_parser, tmp_path, self.SOURCE)
+
+        assert [(c["name"], c["line_number"], c["end_line"], c["type"], c["context"]) for c in result["classes"]] == [
+            ("outer", 1, 5, "struct", None),
+            ("inner", 2, 2, "struct", "outer"),
+            ("outer", 7, 7, "struct", None),
+            ("value", 3, 3, "union", "outer"),
+            ("color", 6, 6, "enum", None),
+        ]
+        assert [(t["name"], t["line_number"]) for t in result["typedefs"]] == [("outer_t", 7)]
+
+        apply = result["functions"][0]
+        assert (apply["name"], apply["line_number"], apply["end_line"]) == ("apply", 8, 14)
+        assert apply["args"] == ["values", "n"]
+        assert [(a["name"], a["type"], a["is_pointer"]) for a in apply["detailed_args"]] == [
+            ("", "int", False), ("values", "int", True), ("n", "int", False),
+        ]
+        # One path, plus the for loop, the conditional expression and every binary expression
+        # (i < n, && and total > 0).
+        assert apply["cyclomatic_complexity"] == 6
+        assert [(v["name"], v["value"]) for v in result["variables"]] == [("total", "0"), ("i", "0")]
+        assert [(c["name"], c["args"]) for c in result["function_calls"]] == [("fn", ["values[i]"])]
@@ -0,0 +1,214 @@
+"""
+Tests for DatabaseManager's driver lifecycle, with the Neo4j driver mocked out.
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src to path for imports (needed for direct test execution)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from codegraphcontext.core import database
+from codegraphcontext.core.database import CONNECTION_CHECK_TTL, DatabaseManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the monotonic clock the manager reads with one the test advances by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(database, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """Makes GraphDatabase.driver return a fresh mock each call, recording them in order."""
+    created = []
+
+    def make_driver(uri, auth, **kwargs):
+        driver = MagicMock()
+        driver.uri, driver.auth, driver.options = uri, auth, kwargs
+        created.append(driver)
+        return driver
+    monkeypatch.setattr(database.GraphDatabase, "driver", make_driver)
+    return created
+
+
+@pytest.fixture
+def manager(monkeypatch, drivers):
+    """A fresh DatabaseManager singleton configured from a test environment."""
+    monkeypatch.setenv("NEO4J_URI", "bolt://localhost:7687")
+    monkeypatch.setenv("NEO4J_USERNAME", "neo4j")
+    monkeypatch.setenv("NEO4J_PASSWORD", "password123")
+    monkeypatch.delenv("NEO4J_POOL_SIZE", raising=False)
+    monkeypatch.delenv("NEO4J_POOL_LIFETIME", raising=False)
+    monkeypatch.setattr(DatabaseManager, "_instance", None)
+    return DatabaseManager()
+
+
+class TestDriverLifecycle:
+    """Tests for creating, sharing and closing the driver"""
+
+    def test_driver_is_created_once_and_shared(self, manager, drivers):
+        """Test repeated get_driver calls return the one verified driver"""
+        driver = manager.get_driver()
+
+        assert manager.get_driver() is driver
+        assert DatabaseManager().get_driver() is driver
+        assert drivers == [driver]
+        driver.verify_connectivity.assert_called_once_with()
+        assert (driver.uri, driver.auth) == ("bolt://localhost:7687", ("neo4j", "password123"))
+
+    def test_close_then_reopen_creates_a_new_driver(self, manager, drivers):
+        """Test closing the driver disconnects the manager and the next get_driver reconnects"""
+        first = manager.get_driver()
+        assert manager.is_connected()
+
+        manager.close_driver()
+
+        first.close.assert_called_once_with()
+        assert not manager.is_connected()
+        second = manager.get_driver()
+        assert second is not first
+        assert drivers == [first, second]
+        assert manager.is_connected()
+
+    def test_close_without_driver_does_nothing(self, manager, drivers):
+        """Test closing a manager that never connected is a no-op"""
+        manager.close_driver()
+
+        assert drivers == []
+        assert not manager.is_connected()
+
+    def test_failed_verification_closes_the_driver_and_keeps_none(self, manager, drivers, monkeypatch):
+        """Test a driver that fails verification is closed, never published, and doesn't block later callers"""
+        monkeypatch.setattr(DatabaseManager, "_probe_socket", staticmethod(lambda uri: (True, None)))
+        make_driver = database.GraphDatabase.driver
+
+        def make_unauthorized_driver(uri, auth, **kwargs):
+            driver = make_driver(uri, auth, **kwargs)
+            driver.verify_connectivity.side_effect = Exception(
+                "The client is unauthorized due to authentication failure."
+            )
+            return driver
+        monkeypatch.setattr(database.GraphDatabase, "driver", make_unauthorized_driver)
+
+        with pytest.raises(Exception, match="unauthorized"):
+            manager.get_driver()
+
+        drivers[0].close.assert_called_once_with()
+        assert manager._driver is None
+        assert DatabaseManager._ready.is_set()
+
+        # The next caller isn't left waiting on the failed attempt and connects normally.
+        monkeypatch.setattr(database.GraphDatabase, "driver", make_driver)
+        assert manager.get_driver() is drivers[1]
+
+    def test_concurrent_callers_wait_for_the_connecting_thread(self, manager, drivers, monkeypatch):
+        """Test a caller arriving during the connection handshake waits for it and gets the same driver"""
+        make_driver = database.GraphDatabase.driver
+        connecting = threading.Event()
+        release = threading.Event()
+
+        def make_slow_driver(uri, auth, **kwargs):
+            connecting.set()
+            release.wait(timeout=10)
+            return make_driver(uri, auth, **kwargs)
+        monkeypatch.setattr(database.GraphDatabase, "driver", make_slow_driver)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(manager.get_driver)
+            assert connecting.wait(timeout=10)
+            second = pool.submit(manager.get_driver)
+            release.set()
+            assert first.result(timeout=10) is second.result(timeout=10)
+
+        assert len(drivers) == 1
+
+    def test_pool_size_and_lifetime_come_from_the_environment(self, manager, drivers, monkeypatch):
+        """Test the connection pool is sized from NEO4J_POOL_SIZE and NEO4J_POOL_LIFETIME"""
+        monkeypatch.setenv("NEO4J_POOL_SIZE", "7")
+        monkeypatch.setenv("NEO4J_POOL_LIFETIME", "60")
+        monkeypatch.setattr(DatabaseManager, "_instance", None)
+
+        options = DatabaseManager().get_driver().options
+
+        assert options["max_connection_pool_size"] == 7
+        assert options["max_connection_lifetime"] == 60
+
+    def test_pool_defaults(self, manager):
+        """Test the pool defaults apply when the environment doesn't size it"""
+        options = manager.get_driver().options
+
+        assert options["max_connection_pool_size"] == 50
+        assert options["max_connection_lifetime"] == 3600
+
+    @pytest.mark.parametrize("value", ["fifty", "0", "-5", "1.5"])
+    def test_invalid_pool_settings_fall_back_to_defaults(self, drivers, monkeypatch, value):
+        """Test an unusable pool setting is ignored instead of failing every connection attempt"""
+        monkeypatch.setenv("NEO4J_URI", "bolt://localhost:7687")
+        monkeypatch.setenv("NEO4J_PASSWORD", "password123")
+        monkeypatch.setenv("NEO4J_POOL_SIZE", value)
+        monkeypatch.setenv("NEO4J_POOL_LIFETIME", value)
+        monkeypatch.setattr(DatabaseManager, "_instance", None)
+
+        options = DatabaseManager().get_driver().options
+
+        assert options["max_connection_pool_size"] == 50
+        assert options["max_connection_lifetime"] == 3600
+
+
+class TestIsConnected:
+    """Tests for the cached connection check"""
+
+    def test_successful_check_is_reused_within_the_ttl(self, manager, clock):
+        """Test a successful check isn't repeated until the TTL has passed"""
+        driver = manager.get_driver()
+
+        assert manager.is_connected()
+        assert manager.is_connected()
+        clock.value += CONNECTION_CHECK_TTL - 0.1
+        assert manager.is_connected()
+        assert driver.get_server_info.call_count == 1
+
+        clock.value += 0.2
+        assert manager.is_connected()
+        assert driver.get_server_info.call_count == 2
+
+    def test_falls_back_to_verify_connectivity(self, manager):
+        """Test a failing server-info call is retried as a full connectivity check"""
+        driver = manager.get_driver()
+        driver.verify_connectivity.reset_mock()
+        driver.get_server_info.side_effect = Exception("no idle connection")
+
+        assert manager.is_connected()
+        driver.verify_connectivity.assert_called_once_with()
+
+    def test_failed_check_is_not_cached(self, manager, clock):
+        """Test a failed check reports disconnected and the next call checks again"""
+        driver = manager.get_driver()
+        driver.get_server_info.side_effect = Exception("no idle connection")
+        driver.verify_connectivity.side_effect = Exception("ServiceUnavailable")
+
+        assert not manager.is_connected()
+        assert not manager.is_connected()
+        assert driver.get_server_info.call_count == 2
+
+        driver.get_server_info.side_effect = None
+        assert manager.is_connected()
+
+    def test_close_clears_the_cached_check(self, manager, clock):
+        """Test a reopened driver is checked afresh rather than trusted from before the close"""
+        manager.get_driver()
+        assert manager.is_connected()
+        manager.close_driver()
+
+        second = manager.get_driver()
+        assert manager.is_connected()
+        second.get_server_info.assert_called_once_with()
@@ -5,10 +5,12 @@ Tests for database configuration validation and error handling.
 import pytest
 import sys
 from pathlib import Path
+from unittest.mock import MagicMock
 
 # Add src to path for imports (needed for direct test execution)
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from codegraphcontext.core import database
 from codegraphcontext.core.database import DatabaseManager
 
 
@@ -187,6 +189,66 @@ class TestConnectionTest:
         # Should provide helpful troubleshooting
         assert any(keyword in error.lower() for keyword in ["troubleshoot", "check", "docker", "try"])
 
+    @pytest.mark.parametrize("uri", ["bolt://:7687", "neo4j://localhost", "neo4j://"])
+    def test_connection_rejects_uri_without_host_or_port(self, uri, monkeypatch):
+        """Test a URI missing its host or port is reported as invalid without probing anything"""
+        probes = []
+        monkeypatch.setattr(database, "_open_probe_connection", lambda *args, **kwargs: probes.append(args))
+
+        is_connected, error = DatabaseManager.test_connection(uri, "neo4j", "password123")
+
+        assert is_connected is False
+        assert "Invalid Neo4j URI format" in error
+        assert probes == []
+
+
+class TestConnectionErrorMessages:
+    """Tests for the troubleshooting text given for driver errors"""
+
+    @staticmethod
+    def _probe_auth_error(message):
+        """Returns the error _probe_auth reports for a driver failing with the given message."""
+        driver = MagicMock()
+        driver.verify_connectivity.side_effect = Exception(message)
+        is_connected, error = DatabaseManager._probe_auth(driver)
+        assert is_connected is False
+        return error
+
+    @pytest.mark.parametrize("message", [
+        "The client is unauthorized due to authentication failure.",
+        "Unauthorized",
+    ])
+    def test_authentication_errors(self, message):
+        """Test authentication failures explain how to fix the credentials"""
+        assert "Authentication failed" in self._probe_auth_error(message)
+
+    @pytest.mark.parametrize("message", [
+        "ServiceUnavailable: the server went away",
+        "Couldn't connect to localhost:7687: Failed to establish connection to ResolvedIPv4Address",
+    ])
+    def test_service_unavailable_errors(self, message):
+        """Test unavailable-service failures suggest starting Neo4j"""
+        assert "Neo4j service is not available" in self._probe_auth_error(message)
+
+    def test_routing_errors(self):
+        """Test routing failures suggest the bolt:// scheme"""
+        error = self._probe_auth_error("Unable to retrieve routing information")
+        assert "Cannot connect to Neo4j routing" in error
+        assert "bolt://" in error
+
+    def test_unrecognized_errors_keep_the_driver_message(self):
+        """Test other failures report the driver's own message"""
+        assert self._probe_auth_error("something else broke") == "Connection failed: something else broke"
+
+    @pytest.mark.parametrize("message, expected", [
+        ("Unable to retrieve routing information: authentication failure", "Authentication failed"),
+        ("Unable to retrieve routing information: failed to establish connection", "Neo4j service is not available"),
+        ("ServiceUnavailable: unauthorized", "Authentication failed"),
+    ])
+    def test_first_matching_category_in_priority_order_wins(self, message, expected):
+        """Test an error matching several categories gets authentication, then service, then routing help"""
+        assert expected in self._probe_auth_error(message)
+
 
 class TestValidationIntegration:
     """Integration tests for validation in real-world scenarios"""
@@ -0,0 +1,343 @@
+"""
+Tests for GraphBuilder's parsing helpers that don't need a database.
+"""
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pathspec
+import pytest
+
+# Add src to path for imports (needed for direct test execution)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from codegraphcontext.core.jobs import JobManager
+from codegraphcontext.tools import graph_builder
+from codegraphcontext.tools.graph_builder import (
+    GraphBuilder, LazyParserMap, SUPPORTED_SUFFIXES, TreeSitterParser, _iter_source_files,
+)
+
+ORIGINAL_SOURCE = b"""import os
+
+def first(a, b):
+    return a + b
+
+class Thing:
+    def method(self):
+        return first(1, 2)
+"""
+
+
+@pytest.fixture
+def builder():
+    """A GraphBuilder for parsing only, without a database connection."""
+    builder = GraphBuilder.__new__(GraphBuilder)
+    builder.parsers = LazyParserMap()
+    builder._parse_pool = None
+    return builder
+
+
+def _nodes(tree):
+    """Returns every node's type and position, in document order."""
+    nodes = []
+    cursor = tree.walk()
+    while True:
+        node = cursor.node
+        nodes.append((node.type, node.start_byte, node.end_byte, node.start_point, node.end_point))
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return nodes
+
+
+class TestIncrementalParsing:
+    """Tests for re-parsing an edited file from its kept tree"""
+
+    @pytest.mark.parametrize("new_source", [
+        b"# header\n" + ORIGINAL_SOURCE,
+        ORIGINAL_SOURCE + b"\ndef last():\n    pass\n",
+        ORIGINAL_SOURCE[len(b"import os\n\n"):],
+        ORIGINAL_SOURCE[:ORIGINAL_SOURCE.index(b"class Thing")],
+        ORIGINAL_SOURCE.replace(b"import os", b"import sys, json"),
+        ORIGINAL_SOURCE.replace(b"return first(1, 2)", b"return first(10, 20) * 3"),
+        ORIGINAL_SOURCE.replace(b"def first(a, b):\n    return a + b\n", b""),
+        ORIGINAL_SOURCE.replace(b"a + b", b"(a +\n        b)"),
+        b"",
+    ], ids=[
+        "insert-at-start", "insert-at-end", "delete-at-start", "delete-at-end", "edit-at-start",
+        "edit-at-end", "delete-middle", "insert-newlines", "delete-all",
+    ])
+    def test_edited_reparse_matches_fresh_parse(self, tmp_path, new_source):
+        """Test a re-parse through the edited old tree gives the same tree as parsing from scratch"""
+        parser = TreeSitterParser("python")
+        source_file = tmp_path / "module.py"
+        parser.parse_tree(ORIGINAL_SOURCE, source_file, keep_tree=True)
+
+        incremental = parser.parse_tree(new_source, source_file)
+        fresh = TreeSitterParser("python").parse_tree(new_source)
+
+        assert incremental.root_node.sexp() == fresh.root_node.sexp()
+        assert _nodes(incremental) == _nodes(fresh)
+
+    def test_trees_are_kept_only_when_asked(self, tmp_path):
+        """Test a build's parses don't fill the tree cache but watched files do"""
+        parser = TreeSitterParser("python")
+        built = tmp_path / "built.py"
+        watched = tmp_path / "watched.py"
+        built.write_bytes(ORIGINAL_SOURCE)
+        watched.write_bytes(ORIGINAL_SOURCE)
+
+        parser.parse(built)
+        parser.parse(watched, keep_tree=True)
+
+        assert list(parser._tree_cache) == [str(watched)]
+
+    def test_concurrent_parses_keep_their_own_source(self, tmp_path):
+        """Test parses of different files sharing one parser across threads don't mix up sources or trees"""
+        parser = TreeSitterParser("python")
+        built = tmp_path / "built.py"
+        watched = tmp_path / "watched.py"
+        built.write_bytes(b"def built():\n    pass\n")
+        watched.write_bytes(ORIGINAL_SOURCE)
+        expected = {path: TreeSitterParser("python").parse(path) for path in (built, watched)}
+
+        def parse(path, keep_tree):
+            return [parser.parse(path, keep_tree=keep_tree) for _ in range(50)]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            built_results = pool.submit(parse, built, False)
+            watched_results = pool.submit(parse, watched, True)
+            assert all(result == expected[built] for result in built_results.result())
+            assert all(result == expected[watched] for result in watched_results.result())
+
+        assert list(parser._tree_cache) == [str(watched)]
+
+
+class TestParserLoading:
+    """Tests for languages whose parser fails to load"""
+
+    @pytest.fixture
+    def broken_go(self, monkeypatch):
+        """Makes loading the Go parser fail, counting the attempts."""
+        attempts = []
+
+        def load(lang):
+            if lang == "go":
+                attempts.append(lang)
+                raise OSError("grammar not found")
+            return TreeSitterParser(lang)
+        monkeypatch.setattr(graph_builder, "TreeSitterParser", load)
+        return attempts
+
+    def test_unloadable_parser_fails_only_its_files(self, builder, broken_go, tmp_path):
+        """Test a file whose parser can't be loaded is reported as an error, without raising"""
+        (tmp_path / "main.go").write_text("package main\n\nfunc main() {}\n")
+        (tmp_path / "app.py").write_text("def run():\n    pass\n")
+
+        for _ in range(2):
+            go_data = builder.parse_file(tmp_path, tmp_path / "main.go")
+            assert "grammar not found" in go_data["error"]
+        py_data = builder.parse_file(tmp_path, tmp_path / "app.py")
+
+        assert "error" not in py_data
+        assert [f["name"] for f in py_data["functions"]] == ["run"]
+        assert broken_go == ["go"]
+
+    def test_unloadable_parser_is_left_out_of_pre_scan(self, builder, broken_go, tmp_path):
+        """Test the pre-scan skips a language whose parser can't be loaded and maps the rest"""
+        (tmp_path / "main.go").write_text("package main\n\nfunc main() {}\n")
+        (tmp_path / "app.py").write_text("def run():\n    pass\n")
+
+        imports_map = builder._pre_scan_for_imports([tmp_path / "main.go", tmp_path / "app.py"])
+
+        assert "run" in imports_map
+        assert "main" not in imports_map
+
+
+class TestPreScan:
+    """Tests for mapping names to the files defining them before parsing"""
+
+    def test_every_language_is_mapped(self, builder, tmp_path):
+        """Test a project in several languages keeps the names of each, not just the last scanned"""
+        files = {
+            "app.py": "def py_func():\n    pass\n\nclass PyClass:\n    pass\n",
+            "web.js": "function jsFunc() {}\nclass JsClass {}\n",
+            "main.go": "package main\n\nfunc GoFunc() {}\n",
+            "util.c": "int c_func(void) { return 0; }\nstruct c_struct { int x; };\n",
+            "shared.py": "def shared():\n    pass\n",
+            "shared.js": "function shared() {}\n",
+        }
+        for name, source in files.items():
+            (tmp_path / name).write_text(source)
+
+        imports_map = builder._pre_scan_for_imports([tmp_path / name for name in files])
+
+        for name, file_name in [("py_func", "app.py"), ("PyClass", "app.py"), ("jsFunc", "web.js"),
+                                ("JsClass", "web.js"), ("GoFunc", "main.go"), ("c_func", "util.c"),
+                                ("c_struct", "util.c")]:
+            assert [Path(path).name for path in imports_map[name]] == [file_name]
+        assert sorted(Path(path).name for path in imports_map["shared"]) == ["shared.js", "shared.py"]
+
+    def test_notebooks_are_mapped(self, builder, tmp_path):
+        """Test functions and classes defined in a notebook's code cells are mapped to the notebook"""
+        nbformat = pytest.importorskip("nbformat")
+        notebook = nbformat.v4.new_notebook(cells=[
+            nbformat.v4.new_markdown_cell("# Notes"),
+            nbformat.v4.new_code_cell("def nbfunc():\n    return 1\n\nclass NbClass:\n    pass\n"),
+        ])
+        notebook_file = tmp_path / "analysis.ipynb"
+        notebook_file.write_text(nbformat.writes(notebook))
+
+        imports_map = builder._pre_scan_for_imports([notebook_file])
+
+        assert imports_map["nbfunc"] == [str(notebook_file.resolve())]
+        assert imports_map["NbClass"] == [str(notebook_file.resolve())]
+
+
+SOURCE_TREE = [
+    "app.py", "README.md",
+    "build/out.py", "build/keep.py", "build/sub/deep.py",
+    "src/main.py", "src/build/gen.py", "src/vendor/lib.js", "src/vendor/keep/lib.py",
+    "docs/conf.py", "node_modules/pkg/index.js", ".hidden/x.py",
+]
+
+
+class TestSourceFileWalk:
+    """Tests for listing a repository's source files with its .cgcignore patterns applied"""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        for name in SOURCE_TREE:
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text("")
+        return tmp_path
+
+    @staticmethod
+    def _expected(root, spec):
+        """The files a full rglob listing keeps once each path is matched against the spec."""
+        return [
+            f for f in root.rglob("*")
+            if f.is_file() and f.suffix in SUPPORTED_SUFFIXES
+            and not (spec and spec.match_file(str(f.relative_to(root))))
+        ]
+
+    @pytest.mark.parametrize("patterns", [
+        [],
+        ["build/"],
+        ["/build"],
+        ["**/vendor/"],
+        ["node_modules", "docs/", "# comment", ""],
+        ["*.js", ".*"],
+        ["build/", "!build/keep.py"],
+        ["src/vendor/", "!src/vendor/keep/"],
+        ["build/*", "!build/sub/"],
+        ["src/**", "!src/main.py"],
+        ["*", "!*/", "!*.py"],
+    ])
+    def test_matches_filtering_every_file(self, repo, patterns):
+        """Test pruning ignored directories keeps exactly the files a per-file match keeps"""
+        spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+        assert list(_iter_source_files(repo, spec)) == self._expected(repo, spec)
+
+    def test_negated_file_under_ignored_directory_is_kept(self, repo):
+        """Test a negation re-includes a file even though its directory is ignored"""
+        spec = pathspec.PathSpec.from_lines("gitwildmatch", ["build/", "!build/keep.py"])
+        files = [f.relative_to(repo).as_posix() for f in _iter_source_files(repo, spec)]
+        assert "build/keep.py" in files
+        assert "build/out.py" not in files
+        assert "src/build/gen.py" not in files
+
+    def test_ignored_directories_are_not_read(self, repo, monkeypatch):
+        """Test directories ignored as a whole are skipped, but never when a negation is present"""
+        scanned = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            scanned.append(Path(path).relative_to(repo).as_posix())
+            return real_scandir(path)
+        monkeypatch.setattr(os, "scandir", scandir)
+
+        list(_iter_source_files(repo, pathspec.PathSpec.from_lines("gitwildmatch", ["node_modules/", "src/vendor"])))
+        assert "node_modules" not in scanned and "src/vendor" not in scanned
+        assert "src" in scanned
+
+        scanned.clear()
+        list(_iter_source_files(repo, pathspec.PathSpec.from_lines("gitwildmatch", ["node_modules/", "!x.py"])))
+        assert "node_modules" in scanned
+
+
+class TestBuildProgress:
+    """Tests for the job progress reported while building a graph"""
+
+    def test_current_file_is_the_file_being_parsed(self, builder, tmp_path, monkeypatch):
+        """Test a job's current file is set before its parse starts, not after it finishes"""
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text(f"def {name[0]}():\n    pass\n")
+        builder.job_manager = JobManager()
+        job_id = builder.job_manager.create_job(str(tmp_path))
+        monkeypatch.setattr(builder, "add_repository_to_graph", lambda *args, **kwargs: None, raising=False)
+        monkeypatch.setattr(builder, "add_files_to_graph", lambda *args, **kwargs: None, raising=False)
+        monkeypatch.setattr(builder, "_create_all_inheritance_links", lambda *args: None, raising=False)
+        monkeypatch.setattr(builder, "_create_all_function_calls", lambda *args: None, raising=False)
+
+        seen = []
+        parse_file = builder.parse_file
+
+        def recording_parse_file(repo_path, file_path, is_dependency=False):
+            seen.append((builder.job_manager.get_job(job_id).current_file, str(file_path)))
+            return parse_file(repo_path, file_path, is_dependency)
+        monkeypatch.setattr(builder, "parse_file", recording_parse_file, raising=False)
+
+        asyncio.run(builder.build_graph_from_path_async(tmp_path, job_id=job_id))
+
+        assert len(seen) == 3
+        assert all(current == parsing for current, parsing in seen)
+        assert builder.job_manager.get_job(job_id).processed_files == 3
+
+
+class TestDirectoryWrites:
+    """Tests for the statements writing a batch's directory chain"""
+
+    def test_directories_are_merged_level_by_level_under_matched_parents(self, builder, tmp_path):
+        """Test each directory level is merged in its own statement, after matching its parents by label"""
+        builder.driver = MagicMock()
+        tx = builder.driver.session.return_value.__enter__.return_value \
+            .begin_transaction.return_value.__enter__.return_value
+        files = [tmp_path / "top.py", tmp_path / "a" / "one.py", tmp_path / "a" / "b" / "two.py",
+                 tmp_path / "c" / "three.py"]
+        file_data = [{"file_path": str(f), "repo_path": str(tmp_path)} for f in files]
+
+        builder.add_files_to_graph(file_data, tmp_path.name, {})
+
+        root = str(tmp_path.resolve())
+        directory_runs = [(c.args[0], c.kwargs["rows"]) for c in tx.run.call_args_list
+                          if "MERGE (d:Directory" in c.args[0]]
+        assert [(query.split("MATCH (p:")[1].split(" ")[0], [row["path"] for row in rows])
+                for query, rows in directory_runs] == [
+            ("Repository", [os.path.join(root, "a"), os.path.join(root, "c")]),
+            ("Directory", [os.path.join(root, "a", "b")]),
+        ]
+        assert all(query.index("MATCH (p:") < query.index("MERGE (d:Directory") for query, _ in directory_runs)
+
+
+class TestFileDeletion:
+    """Tests for the statement deleting a file and the directories it leaves empty"""
+
+    def test_file_and_orphaned_directories_are_deleted_in_one_statement(self, builder, tmp_path):
+        """Test deleting a file runs one statement, without listing or sorting its ancestor directories first"""
+        builder.driver = MagicMock()
+        session = builder.driver.session.return_value.__enter__.return_value
+        file_path = tmp_path / "a" / "b" / "one.py"
+
+        builder.delete_file_from_graph(str(file_path))
+
+        assert session.run.call_count == 1
+        query = session.run.call_args.args[0]
+        assert query == graph_builder.DELETE_FILE_QUERY
+        assert session.run.call_args.kwargs == {"path": str(file_path.resolve())}
+        assert "ORDER BY" not in query and "RETURN" not in query
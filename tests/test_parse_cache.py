@@ -0,0 +1,162 @@
+"""
+Tests for the on-disk parse cache.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports (needed for direct test execution)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from codegraphcontext.core import parse_cache
+from codegraphcontext.core.parse_cache import ParseCache, PARSE_CACHE_ENV, EVICTION_CHECK_FRACTION
+from codegraphcontext.tools import graph_builder
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "cache", enabled=True)
+
+
+class TestParseCache:
+    """Tests for ParseCache keys, hits and invalidation"""
+
+    def test_hit_returns_stored_result(self, cache, tmp_path):
+        """Test a stored result is returned for the same file contents"""
+        source_file = tmp_path / "a.py"
+        key = cache.key(source_file, "python", b"x = 1\n", is_dependency=False)
+        cache.put(key, {"file_path": str(source_file), "variables": ["x"]})
+
+        assert cache.key(source_file, "python", b"x = 1\n", is_dependency=False) == key
+        assert cache.get(key) == {"file_path": str(source_file), "variables": ["x"]}
+
+    def test_changed_content_misses(self, cache, tmp_path):
+        """Test changing the file contents or parse options gives a different, empty key"""
+        source_file = tmp_path / "a.py"
+        key = cache.key(source_file, "python", b"x = 1\n")
+        cache.put(key, {"variables": ["x"]})
+
+        changed_key = cache.key(source_file, "python", b"x = 2\n")
+        assert changed_key != key
+        assert cache.get(changed_key) is None
+        assert cache.key(source_file, "python", b"x = 1\n", is_dependency=True) != key
+
+    def test_version_change_wipes_entries(self, tmp_path, monkeypatch):
+        """Test entries written by other grammars or parsers are removed"""
+        root = tmp_path / "cache"
+        monkeypatch.setattr(parse_cache, "_cache_version", lambda: "v1")
+        old = ParseCache(root, enabled=True)
+        key = old.key(tmp_path / "a.py", "python", b"x = 1\n")
+        old.put(key, {"variables": ["x"]})
+        assert old.get(key) is not None
+
+        monkeypatch.setattr(parse_cache, "_cache_version", lambda: "v2")
+        new = ParseCache(root, enabled=True)
+        assert new.key(tmp_path / "a.py", "python", b"x = 1\n") == key
+        assert new.get(key) is None
+        assert (root / parse_cache.VERSION_FILE_NAME).read_text() == "v2"
+
+    def test_disabled_by_default(self, tmp_path, monkeypatch):
+        """Test nothing is written to disk unless the cache is switched on"""
+        monkeypatch.delenv(PARSE_CACHE_ENV, raising=False)
+        cache = ParseCache(tmp_path / "cache")
+        assert cache.key(tmp_path / "a.py", "python", b"x = 1\n") is None
+        assert not (tmp_path / "cache").exists()
+
+        monkeypatch.setenv(PARSE_CACHE_ENV, "1")
+        assert ParseCache(tmp_path / "cache").key(tmp_path / "a.py", "python", b"x = 1\n") is not None
+
+    def test_disabled_by_environment(self, tmp_path, monkeypatch):
+        """Test the cache can be switched off through the environment"""
+        monkeypatch.setenv(PARSE_CACHE_ENV, "0")
+        cache = ParseCache(tmp_path / "cache")
+        assert cache.key(tmp_path / "a.py", "python", b"x = 1\n") is None
+        assert not (tmp_path / "cache").exists()
+
+
+class TestParserCaching:
+    """Tests for parse results served through TreeSitterParser"""
+
+    def test_unchanged_file_is_not_parsed_again(self, cache, tmp_path, monkeypatch):
+        """Test a second parse of an unchanged file comes from the cache"""
+        monkeypatch.setattr(graph_builder, "_parse_cache", cache)
+        source_file = tmp_path / "a.py"
+        source_file.write_text("def f():\n    return 1\n")
+        parser = graph_builder.TreeSitterParser("python")
+
+        first = parser.parse(source_file)
+        assert [f["name"] for f in first["functions"]] == ["f"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed again")
+        monkeypatch.setattr(parser.language_specific_parser, "parse", fail)
+        assert parser.parse(source_file) == first
+
+    def test_changed_file_is_parsed_again(self, cache, tmp_path, monkeypatch):
+        """Test a file whose contents changed is parsed rather than served from the cache"""
+        monkeypatch.setattr(graph_builder, "_parse_cache", cache)
+        source_file = tmp_path / "a.py"
+        source_file.write_text("def f():\n    return 1\n")
+        parser = graph_builder.TreeSitterParser("python")
+        parser.parse(source_file)
+
+        source_file.write_text("def g():\n    return 1\n")
+        assert [f["name"] for f in parser.parse(source_file)["functions"]] == ["g"]
+
+    def test_pre_scan_reads_each_file_once(self, cache, tmp_path, monkeypatch):
+        """Test a pre-scan miss scans the bytes read for the cache key instead of reading the file again"""
+        monkeypatch.setattr(graph_builder, "_parse_cache", cache)
+        source_file = tmp_path / "a.py"
+        source_file.write_text("def f():\n    return 1\n")
+        reads = []
+        read_bytes = Path.read_bytes
+
+        def counting_read_bytes(path):
+            if path == source_file:
+                reads.append(path)
+            return read_bytes(path)
+        monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+
+        imports_map = graph_builder._pre_scan("python", [source_file], graph_builder.TreeSitterParser("python"))
+
+        assert imports_map == {"f": [str(source_file.resolve())]}
+        assert len(reads) == 1
+
+
+class TestParseCacheEviction:
+    """Tests for keeping the cache under its size limit"""
+
+    def _put(self, cache, tmp_path, name, mtime):
+        key = cache.key(tmp_path / name, "python", name.encode())
+        cache.put(key, {"file_path": name, "source": "x" * 1000})
+        os.utime(cache._entry_path(key), (mtime, mtime))
+        return key
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test eviction removes the entries used longest ago, counting hits as uses"""
+        cache = ParseCache(tmp_path / "cache", enabled=True, max_size=10 ** 9)
+        keys = [self._put(cache, tmp_path, name, mtime) for name, mtime in
+                [("a.py", 1000), ("b.py", 2000), ("c.py", 3000), ("d.py", 4000)]]
+        entry_size = cache._entry_path(keys[0]).stat().st_size
+        assert cache.get(keys[0]) is not None
+
+        cache.max_size = int(entry_size * 2.5)
+        cache.evict()
+
+        assert [cache.get(key) is not None for key in keys] == [True, False, False, True]
+
+    def test_writes_keep_the_cache_under_its_limit(self, tmp_path):
+        """Test storing entries past the limit evicts older ones on its own"""
+        cache = ParseCache(tmp_path / "cache", enabled=True, max_size=20000)
+        for i in range(100):
+            key = cache.key(tmp_path / f"{i}.py", "python", b"x = 1\n")
+            cache.put(key, {"file_path": f"{i}.py", "source": "x" * 1000})
+
+        sizes = [path.stat().st_size for path in (tmp_path / "cache").rglob("*.pkl")]
+        # The size is re-measured after each slice of the limit, so it can overshoot by one slice.
+        assert 0 < sum(sizes) <= 20000 + 20000 // EVICTION_CHECK_FRACTION + max(sizes)
+        assert len(sizes) < 100
+        assert cache.get(key) is not None